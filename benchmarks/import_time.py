@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules needed only by GUI and reporting, they must not be loaded by the headless entry points
+FORBIDDEN_MODULES = ['tkinter', 'matplotlib']
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(module):
+    # One fresh interpreter per measurement, so nothing is cached in sys.modules
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+
+    imports = {}
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            imports[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+
+    return imports
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Measure import time of package entry points.")
+    parser.add_argument('modules', nargs='*', default=['src.algorithm.algorithm', 'src.cli'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=None, help="fail when median import time is higher")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    arguments = parser.parse_args(arguments)
+
+    results = {}
+    failed = False
+    for module in arguments.modules:
+        runs = [measure(module) for _ in range(arguments.repeat)]
+        cumulative_ms = statistics.median(run[module][1] for run in runs) / 1000
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[:10]
+        forbidden = sorted({name for name in runs[-1] for forbidden_module in FORBIDDEN_MODULES
+                            if name == forbidden_module or name.startswith(forbidden_module + '.')})
+
+        results[module] = {
+            'median_ms': cumulative_ms,
+            'forbidden_imports': forbidden,
+            'slowest_self_ms': {name: self_us / 1000 for name, (self_us, _) in slowest}
+        }
+        failed |= len(forbidden) > 0 or (arguments.budget_ms is not None and cumulative_ms > arguments.budget_ms)
+
+    if arguments.json:
+        print(json.dumps(results, indent=4))
+    else:
+        for module, result in results.items():
+            print(f"{module}: {result['median_ms']:.1f} ms")
+            if result['forbidden_imports']:
+                print(f"  forbidden imports: {', '.join(result['forbidden_imports'])}")
+            for name, self_ms in result['slowest_self_ms'].items():
+                print(f"  {self_ms:8.2f} ms  {name}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Members are created the way population creates children and filled like evaluated members,
+# list holding them is included, numpy arrays of genes too. Checkouts without Population.new_member
+# (e.g. the original dict-backed Member with one chromosome object per gene) build members the old way,
+# they always have two genes and evaluate themselves when created
+MEASURE = '''
+import json, sys, tracemalloc
+sys.path.insert(0, sys.argv[1])
+from src.models.chromosome import ChromosomeType
+from src.models import population as populations
+
+chromosome_type, members_number, genes_number = ChromosomeType[sys.argv[2]], int(sys.argv[3]), int(sys.argv[4])
+if hasattr(populations.Population, 'new_member'):
+    population = (populations.PopulationBinary if ChromosomeType.BINARY == chromosome_type
+                  else populations.PopulationReal)([-10, 10], 6, chromosome_type, 1, 'minimization',
+                                                   genes_number=genes_number)
+    new_member, evaluated = population.new_member, True
+else:
+    from src.models.member import Member
+    new_member, evaluated = lambda: Member([-10, 10], 6, chromosome_type), False
+
+tracemalloc.start()
+members = [new_member() for _ in range(members_number)]
+if evaluated:
+    for idx, member in enumerate(members):
+        member.fitness_value = float(idx)
+        member.dirty = False
+print(json.dumps(tracemalloc.get_traced_memory()[0] / members_number))
+'''
+
+
+def measure(root, chromosome_type, members_number, genes_number):
+    # One fresh interpreter per measurement, any checkout of the package can be measured
+    process = subprocess.run([sys.executable, '-c', MEASURE, root, chromosome_type, str(members_number),
+                              str(genes_number)], cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(process.stdout)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Measure memory of object engine members.")
+    parser.add_argument('--members', type=int, default=10 ** 6)
+    parser.add_argument('--genes', type=int, default=2)
+    parser.add_argument('--root', action='append', default=None,
+                        help="package checkout to measure, repeat to compare checkouts (this one by default)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    arguments = parser.parse_args(arguments)
+
+    results = {}
+    for root in arguments.root or [ROOT]:
+        results[root] = {chromosome_type.lower(): measure(os.path.abspath(root), chromosome_type, arguments.members,
+                                                          arguments.genes)
+                         for chromosome_type in ('REAL', 'BINARY')}
+
+    if arguments.json:
+        print(json.dumps({'members': arguments.members, 'genes': arguments.genes, 'bytes_per_member': results},
+                         indent=4))
+    else:
+        for root, result in results.items():
+            print(f"{root}: {', '.join(f'{name} {size:.0f} B' for name, size in result.items())} per member")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from src.algorithm.algorithm import create_algorithm
+from src.algorithm.conf import Config
+
+PERCENT_OF_SELECTED = 30
+TOURNAMENT_SIZE = 3
+PROBABILITY = 0.8
+
+
+def object_engine(population):
+    return hasattr(population, 'members')
+
+
+def pairs(population):
+    # One generation of parent pairs, members of object population or rows of genotype matrix
+    members_number = len(population.members) if object_engine(population) else len(population)
+    first, second = population.rng.integers(members_number, size=(2, members_number // 2))
+    if object_engine(population):
+        return [population.members[idx] for idx in first], [population.members[idx] for idx in second]
+    return population.genotypes[first], population.genotypes[second]
+
+
+def real_crossover(operator):
+    # Object engine crosses one pair per call, array engine all pairs at once
+    def run(population, parents):
+        if object_engine(population):
+            for parent1, parent2 in zip(*parents):
+                operator(population, parent1, parent2)
+        else:
+            operator(population, *parents)
+    return run
+
+
+def real_mutation(operator):
+    def run(population, parents):
+        if object_engine(population):
+            for member in population.members:
+                operator(population, member)
+        else:
+            operator(population)
+    return run
+
+
+def epoch(algorithm, population):
+    algorithm.evolve(population)
+    algorithm.save_epoch(population)
+
+
+SELECTIONS = {
+    'best_selection': lambda population, parents: population.best_selection(PERCENT_OF_SELECTED),
+    'tournament_selection': lambda population, parents: population.tournament_selection(TOURNAMENT_SIZE),
+    'roulette_wheel_selection': lambda population, parents: population.roulette_wheel_selection(PERCENT_OF_SELECTED),
+    'stochastic_universal_selection': lambda population, parents: population.stochastic_universal_selection(
+        PERCENT_OF_SELECTED),
+    'elite_strategy': lambda population, parents: population.elite_strategy(10)
+}
+
+BINARY_OPERATORS = {
+    'single_point_crossover': lambda population, parents: population.multipoint_crossover(*parents, PROBABILITY, 1),
+    'two_point_crossover': lambda population, parents: population.multipoint_crossover(*parents, PROBABILITY, 2),
+    'three_point_crossover': lambda population, parents: population.multipoint_crossover(*parents, PROBABILITY, 3),
+    'homogeneous_crossover': lambda population, parents: population.homogeneous_crossover(*parents, PROBABILITY),
+    'boundary_mutation': lambda population, parents: population.boundary_mutation(PROBABILITY),
+    'single_point_mutation': lambda population, parents: population.multipoint_mutation(PROBABILITY, 1),
+    'two_point_mutation': lambda population, parents: population.multipoint_mutation(PROBABILITY, 2),
+    'inversion': lambda population, parents: population.inversion(PROBABILITY)
+}
+
+REAL_OPERATORS = {
+    'arithmetic_crossover': real_crossover(lambda population, *parents: population.arithmetic_crossover(
+        *parents, PROBABILITY)),
+    'blend_alpha_crossover': real_crossover(lambda population, *parents: population.blend_crossover(
+        *parents, PROBABILITY, 0.5, bound_handling='clip')),
+    'blend_alpha_beta_crossover': real_crossover(lambda population, *parents: population.blend_crossover(
+        *parents, PROBABILITY, 0.5, 0.3, 'clip')),
+    'average_crossover': real_crossover(lambda population, *parents: population.average_crossover(
+        *parents, PROBABILITY)),
+    'linear_crossover': real_crossover(lambda population, *parents: population.linear_crossover(
+        *parents, PROBABILITY, 'clip')),
+    'uniform_mutation': real_mutation(lambda population, *member: population.uniform_mutation(*member, PROBABILITY)),
+    'gauss_mutation': real_mutation(lambda population, *member: population.gauss_mutation(*member, PROBABILITY))
+}
+
+
+def create_config(chromosome_type, engine, size, precision):
+    return Config().from_dict({
+        'chromosome_type': chromosome_type, 'population_engine': engine, 'population_size': size,
+        'optimization': 'minimization', 'objective': 'Rastrigin', 'interval': [-5.12, 5.12], 'epoch_amount': 1,
+        'selection': 'tournament', 'percent_of_selected': TOURNAMENT_SIZE, 'percent_of_elite': 10,
+        'crossover': 'two-point' if 'binary' == chromosome_type else 'blend-alpha',
+        'crossover_probability': PROBABILITY, 'mutation': 'boundary' if 'binary' == chromosome_type else 'Gauss',
+        'mutation_probability': 0.1, 'chromosome_precision': precision, 'inversion_probability': 0.05,
+        'alpha': 0.5, 'beta': 0.3, 'bound_handling': 'clip', 'statistics': ['mean', 'stdev'],
+        'output_dir': os.path.join(tempfile.gettempdir(), 'genetic_algorithm_benchmarks'), 'seed': 0
+    })
+
+
+def measure(algorithm, population, state, benchmark, repeat):
+    # Every repeat starts from the same evaluated population, only the benchmarked call is timed
+    times = []
+    for _ in range(repeat):
+        population.restore(state)
+        parents = pairs(population)
+        start = time.perf_counter()
+        benchmark(algorithm, population, parents)
+        times.append(time.perf_counter() - start)
+
+    return times
+
+
+def benchmarks(chromosome_type):
+    operators = {**SELECTIONS, **(BINARY_OPERATORS if 'binary' == chromosome_type else REAL_OPERATORS)}
+    return {**{name: lambda algorithm, population, parents, operator=operator: operator(population, parents)
+               for name, operator in operators.items()},
+            'epoch': lambda algorithm, population, parents: epoch(algorithm, population)}
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(arguments):
+    results = []
+    for chromosome_type in arguments.types:
+        for engine in arguments.engines:
+            for size in arguments.sizes:
+                for precision in (arguments.precisions if 'binary' == chromosome_type else [None]):
+                    algorithm = create_algorithm(create_config(chromosome_type, engine, size, precision or 6))
+                    population = algorithm.create_population()
+                    population.update_fitness_values()
+                    state = population.state()
+
+                    for name, benchmark in benchmarks(chromosome_type).items():
+                        if arguments.filter is not None and arguments.filter not in name:
+                            continue
+                        times = measure(algorithm, population, state, benchmark, arguments.repeat)
+                        results.append({'benchmark': name, 'chromosome_type': chromosome_type, 'engine': engine,
+                                        'size': size, 'precision': precision, 'median_s': statistics.median(times),
+                                        'min_s': min(times), 'repeat': arguments.repeat})
+                        if not arguments.json:
+                            print(f"{chromosome_type:6} {engine:6} {size:>8} {precision or '':>2} {name:32} "
+                                  f"{results[-1]['median_s'] * 1000:12.3f} ms", flush=True)
+                    algorithm.objective.close()
+
+    return results
+
+
+def key(result):
+    return result['benchmark'], result['chromosome_type'], result['engine'], result['size'], result['precision']
+
+
+def compare(results, baseline_path):
+    # Ratio of medians, above 1 is slower than baseline
+    with open(baseline_path) as f:
+        baseline = {key(result): result for result in json.load(f)['results']}
+
+    return {key(result): result['median_s'] / baseline[key(result)]['median_s']
+            for result in results if key(result) in baseline and baseline[key(result)]['median_s'] > 0}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Time selection, crossover, mutation and whole epochs.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 2, 10 ** 4, 10 ** 6])
+    parser.add_argument('--precisions', type=int, nargs='+', default=[3, 6], help="binary chromosome precisions")
+    parser.add_argument('--types', nargs='+', choices=['binary', 'real'], default=['binary', 'real'])
+    parser.add_argument('--engines', nargs='+', choices=['object', 'array'], default=['object', 'array'])
+    parser.add_argument('--filter', default=None, help="run only benchmarks with this text in name")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help="write results as JSON to this file")
+    parser.add_argument('--compare', default=None, help="JSON results of other commit to compare with")
+    parser.add_argument('--max-ratio', type=float, default=None,
+                        help="fail when any benchmark is this many times slower than compared results")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    arguments = parser.parse_args(arguments)
+
+    report = {'commit': commit(), 'python': platform.python_version(), 'numpy': np.__version__,
+              'machine': platform.machine(), 'results': run(arguments)}
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    ratios = compare(report['results'], arguments.compare) if arguments.compare is not None else {}
+    if arguments.json:
+        print(json.dumps({**report, 'ratios': [{'benchmark': k[0], 'chromosome_type': k[1], 'engine': k[2],
+                                                'size': k[3], 'precision': k[4], 'ratio': ratio}
+                                               for k, ratio in ratios.items()]}, indent=4))
+    else:
+        for (name, chromosome_type, engine, size, precision), ratio in ratios.items():
+            print(f"{chromosome_type:6} {engine:6} {size:>8} {precision or '':>2} {name:32} {ratio:8.2f}x")
+
+    return 1 if arguments.max_ratio is not None and any(ratio > arguments.max_ratio for ratio in ratios.values()) \
+        else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
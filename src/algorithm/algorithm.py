@@ -1,267 +1,550 @@
+import math
 import os
-import random
 import time
-import tkinter as tk
-import tkinter.messagebox
-import csv
-import sys
-import copy
-import matplotlib.pyplot as plt
-from functools import cmp_to_key
-from statistics import mean, stdev
+import numpy as np
 from abc import ABC, abstractmethod
-from src.algorithm.conf import Config, BinaryCrossover, RealCrossover, Selection, BinaryMutation, RealMutation, OptimizationType
+from contextlib import nullcontext
+from src.algorithm.conf import Config, BinaryCrossover, RealCrossover, Selection, BinaryMutation, RealMutation, \
+    PopulationEngine, StopReason, Stage, load_config
+from src.models.chromosome import ChromosomeType
 from src.models.population import PopulationBinary, PopulationReal
-from src.utils.utils import compare_members
+from src.models.array_population import ArrayPopulationBinary, ArrayPopulationReal
+from src.models.objective import get_objective
+from src.algorithm.evaluation import Evaluator, FitnessCache
+from src.utils.utils import random_pairs
+from src.algorithm.metrics import create_metrics_sink, metrics_path
+from src.algorithm.termination import Termination
+from src.algorithm.checkpoint import save_checkpoint, load_checkpoint, random_state, restore_random_state
+from src.algorithm.profiling import Profiler
+
+max_summary_values = 10  # Chromosome values shown in summary
+no_profiling = nullcontext()  # Stage of every epoch when profiling is disabled
+
+
+class Result:
+    def __init__(self, algorithm, execution_time):
+        self.execution_time = execution_time
+        self.best_values = algorithm.best_values
+        self.best_fitness_value = algorithm.best_fitness_value
+        self.epochs = max(algorithm.epochs - 1, 0)  # Evolved epochs, first recorded epoch is initial population
+        self.stop_reason = algorithm.stop_reason
+        self.evaluations = algorithm.evaluations
+        self.cache_hits = algorithm.fitness_cache.hits if algorithm.fitness_cache is not None else None
+        self.cache_misses = algorithm.fitness_cache.misses if algorithm.fitness_cache is not None else None
+
+        # History of epochs, empty unless kept in memory, full history is in metrics file
+        self.epoch_best_values = algorithm.epoch_best_values
+        self.epoch_best_fitness_values = algorithm.epoch_best_fitness_values
+        self.epoch_average = algorithm.epoch_average
+        self.epoch_standard_deviation = algorithm.epoch_standard_deviation
+        self.history = algorithm.history
+
+        self.output_folder = algorithm.output_folder
+        self.metrics_path = algorithm.metrics_path
+
+        # Stage times and counters, None unless profiling is enabled
+        self.profile = algorithm.profiler.to_dict() if algorithm.profiler is not None else None
+        self.profile_path = algorithm.profile_path if algorithm.profiler is not None else None
+
+    def summary(self):
+        cache_report = f"\nFitness cache: {self.cache_hits} hits, {self.cache_misses} misses" \
+            if self.cache_hits is not None else ""
+        profile_report = "\nStage times: " + ', '.join(
+            f"{name} {time_ns / 1e6:.1f} ms" for name, time_ns in
+            sorted(self.profile['times_ns'].items(), key=lambda item: -item[1])) if self.profile is not None else ""
+
+        # Long genomes are shortened, all values are in to_dict and metrics file
+        values = ', '.join(str(round(value, 10)) for value in self.best_values[:max_summary_values])
+        if len(self.best_values) > max_summary_values:
+            values += f", ... ({len(self.best_values)} values)"
+
+        return f"Solution found in {self.execution_time} seconds.\n" \
+               f"f({values}) = " \
+               f"{round(self.best_fitness_value, 10)}\n" \
+               f"Objective evaluations: {self.evaluations}\n" \
+               f"Stopped after {self.epochs} epochs: {self.stop_reason}" \
+               f"{cache_report}" \
+               f"{profile_report}"
+
+    def to_dict(self):
+        return {
+            'execution_time': self.execution_time,
+            'best_values': list(self.best_values),
+            'best_fitness_value': self.best_fitness_value,
+            'evaluations': self.evaluations,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'epochs': self.epochs,
+            'stop_reason': self.stop_reason,
+            'output_folder': self.output_folder,
+            'metrics_path': self.metrics_path,
+            'profile_path': self.profile_path
+        }
 
 
 class Algorithm(ABC):
 
     def __init__(self, config: Config):
         self.config: Config = config
-        self.epoch_best_members = []  # Best member in each epoch
-        self.epoch_average = []  # Best member in each epoch
-        self.epoch_standard_deviation = []  # Best member in each epoch
-
-        # Output path
-        folder = sys.argv[0][:-7] + f'output/{config.optimization}_S={config.selection}_C={config.crossover}_M={config.mutation}/'
-        if not os.path.isdir(folder):
-            os.mkdir(folder)
-
-        self.output_file_path = folder + 'output.csv'
-        self.plot_path_fv = folder + 'fitness_value.png'
-        self.plot_path_avg = folder + 'average.png'
-        self.plot_path_stdev = folder + 'standard_deviation.png'
+        # One generator for all random draws of run, seed can be an int or a spawned SeedSequence
+        self.rng = np.random.default_rng(config.seed)
+
+        self.objective = Evaluator(get_objective(config.objective, config.genes_number), config.evaluation_backend,
+                                   config.evaluation_workers, config.evaluation_chunk_size)
+        self.fitness_cache = FitnessCache(config.fitness_cache_size, config.fitness_cache_decimals) \
+            if config.fitness_cache_size > 0 else None
+        self.best_values = None  # Chromosome values of best member in last epoch
+        self.best_fitness_value = None
+        self.epochs = 0  # Recorded epochs, initial population included
+        self.stop_reason = StopReason.EPOCH_AMOUNT.value
+        self.termination = Termination(config)
+        self.history = {}  # Enabled statistics of each epoch, by name
+
+        # Output path, output folder in working directory unless configured
+        output_dir = config.output_dir if config.output_dir is not None else os.path.join(os.getcwd(), 'output')
+        self.output_folder = os.path.join(
+            output_dir, f'{config.optimization}_S={config.selection}_C={config.crossover}_M={config.mutation}')
+        os.makedirs(self.output_folder, exist_ok=True)
+
+        self.metrics_path = metrics_path(config.metrics_format, self.output_folder)
+        self.metrics = None  # Opened when run starts, island processes only keep history
+
+        self.checkpoint_path = config.checkpoint_path if config.checkpoint_path is not None \
+            else os.path.join(self.output_folder, 'checkpoint.npz')
+
+        # Profiling, stages are timed only when profiler exists
+        self.profiler = None
+        self.profile_path = config.profile_path if config.profile_path is not None \
+            else os.path.join(self.output_folder, 'profile.json')
+        if config.profile:
+            self.enable_profiling()
+        self.hooks = []  # Called as hook(epoch, profiler) after every recorded epoch, 0 is initial population
 
     @abstractmethod
-    def start(self):
+    def start(self) -> Result:
         pass
 
-    def write_to_file(self):
-        header = ['Epoch', 'X1', 'X2', 'Fitness_value', 'Average', 'Standard_deviation']
-
-        with open(self.output_file_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-
-            # write the header
-            writer.writerow(header)
-
-            # write the data
-            for epoch in range(len(self.epoch_best_members)):
-                writer.writerow([
-                    epoch + 1,
-                    self.epoch_best_members[epoch].chromosomes[0].calculate_value(),
-                    self.epoch_best_members[epoch].chromosomes[1].calculate_value(),
-                    self.epoch_best_members[epoch].fitness_value,
-                    self.epoch_average[epoch],
-                    self.epoch_standard_deviation[epoch]
-                ])
-
-    def create_plots(self):
-        x = range(1, self.config.epoch_amount + 2)
-
-        plt.xlabel('Epoch')
-        plt.ylabel('Fitness value')
-        plt.title("Chart of fitness value by epoch")
-
-        plt.plot(x, [best_member.fitness_value for best_member in self.epoch_best_members])
-        plt.savefig(self.plot_path_fv)
-        plt.cla()
+    @property
+    def evaluations(self):
+        return self.objective.evaluations
+
+    def enable_profiling(self):
+        # Before population is created, so it counts rejected children too
+        if self.profiler is None:
+            self.profiler = Profiler()
+            self.objective.profiler = self.profiler
+
+    def add_hook(self, hook):
+        # Hooks get profile of run so far, so profiling is enabled with first of them
+        self.enable_profiling()
+        self.hooks.append(hook)
+
+    def stage(self, stage: Stage):
+        return self.profiler.stage(stage.value) if self.profiler is not None else no_profiling
+
+    def update_counters(self):
+        self.profiler.counters['evaluations'] = self.evaluations
+        if self.fitness_cache is not None:
+            self.profiler.counters['cache_hits'] = self.fitness_cache.hits
+            self.profiler.counters['cache_misses'] = self.fitness_cache.misses
+
+    @property
+    def epoch_best_values(self):
+        # Chromosome values of best member in each epoch
+        return self.history.get('best_values', [])
+
+    @property
+    def epoch_best_fitness_values(self):
+        # Fitness value of best member in each epoch
+        return self.history.get('fitness_value', [])
+
+    @property
+    def epoch_average(self):
+        return self.history.get('average', [])
+
+    @property
+    def epoch_standard_deviation(self):
+        return self.history.get('standard_deviation', [])
+
+    def open_metrics(self, state=None):
+        self.metrics = create_metrics_sink(self.config.metrics_format, self.metrics_path,
+                                           self.config.metrics_flush_interval, state)
+
+    def close_metrics(self):
+        if self.metrics is not None:
+            self.metrics.close()
+
+    def save_epoch(self, population):
+        with self.stage(Stage.STATISTICS):
+            statistics = population.statistics(self.config.statistics, self.config.statistics_quantiles)
+        self.record_epoch(statistics)
+        return statistics
+
+    def record_epoch(self, statistics: dict):
+        self.best_values = statistics['best_values']
+        self.best_fitness_value = statistics['fitness_value']
+        self.epochs += 1
+
+        if self.config.keep_history:
+            for name, value in statistics.items():
+                self.history.setdefault(name, []).append(value)
+
+        # Metrics are streamed to disk, so memory does not grow with number of epochs
+        if self.metrics is not None:
+            with self.stage(Stage.METRICS):
+                self.metrics.write(statistics)
+
+        if self.hooks:
+            self.update_counters()
+            for hook in self.hooks:
+                hook(self.epochs - 1, self.profiler)
+
+    def finish(self, start_time):
+        # Calculating execution time
+        execution_time = round(time.time() - start_time, 2)
+        self.objective.close()
+        self.close_metrics()
 
-        plt.xlabel('Epoch')
-        plt.ylabel('Average')
-        plt.title("Chart of average by epoch")
+        if self.profiler is not None:
+            self.update_counters()
+            self.profiler.dump(self.profile_path)
 
-        plt.plot(x, [avg for avg in self.epoch_average])
-        plt.savefig(self.plot_path_avg)
-        plt.cla()
+        return Result(self, execution_time)
 
-        plt.xlabel('Epoch')
-        plt.ylabel('Standard deviation')
-        plt.title("Chart of standard deviation by epoch")
 
-        plt.plot(x, [s_dev for s_dev in self.epoch_standard_deviation])
-        plt.savefig(self.plot_path_stdev)
-        plt.cla()
+# Algorithm evolving one population, epoch by epoch
+class PopulationAlgorithm(Algorithm):
 
+    @abstractmethod
+    def create_population(self):
+        pass
 
-class BinaryAlgorithm(Algorithm):
-    def __init__(self, config: Config):
-        super().__init__(config)
+    @abstractmethod
+    def evolve(self, population):
+        pass
 
     def start(self):
         # Start time execution
         start_time = time.time()
 
-        population = PopulationBinary(
-                self.config.interval,
-                self.config.chromosome_precision,
-                self.config.chromosome_type,
-                self.config.population_size,
-                self.config.optimization
-            )
-
-        # Loop
-        for _ in range(self.config.epoch_amount):
-            fitness_values = [member.fitness_value for member in population.members]
-
-            self.epoch_best_members.append(copy.deepcopy(sorted(population.members,
-                                                                key=cmp_to_key(compare_members),
-                                                                reverse=OptimizationType.MAXIMIZATION.value == population.optimization)[0]))
-            self.epoch_average.append(mean(fitness_values))
-            self.epoch_standard_deviation.append(stdev(fitness_values))
-
-            # Chosen elite members
+        population = self.create_population()
+        checkpoint = load_checkpoint(self.checkpoint_path) \
+            if self.config.resume and os.path.exists(self.checkpoint_path) else None
+        if checkpoint is not None:
+            self.restore_checkpoint(population, checkpoint)
+        self.open_metrics(checkpoint['metrics'] if checkpoint is not None else None)
+
+        # Loop, metrics written so far are flushed and evaluation workers stopped even when run fails
+        last_checkpoint_time = time.time()
+        self.termination.start()
+        try:
+            for epoch in range(int(checkpoint['epoch']) if checkpoint is not None else 0, self.config.epoch_amount):
+                statistics = self.save_epoch(population)
+
+                # Early stopping, population of last recorded epoch is final one
+                stop_reason = self.termination.check(statistics, self.evaluations)
+                if stop_reason is not None:
+                    self.stop_reason = stop_reason
+                    break
+
+                self.evolve(population)
+
+                if self.checkpoint_due(epoch + 1, last_checkpoint_time):
+                    with self.stage(Stage.CHECKPOINT):
+                        self.save_checkpoint(population, epoch + 1)
+                    last_checkpoint_time = time.time()
+            else:
+                self.save_epoch(population)
+        finally:
+            self.close_metrics()
+            self.objective.close()
+
+        return self.finish(start_time)
+
+    def select(self, population, elite_number):
+        # Selection methods have the same signatures in both engines, selected members and elite members
+        # never outnumber population
+        limit = population.size - elite_number
+        {
+            Selection.BEST.value: lambda: population.best_selection(self.config.percent_of_selected, limit),
+            Selection.TOURNAMENT.value: lambda: population.tournament_selection(
+                self.config.percent_of_selected, self.config.tournaments_number, self.config.tournament_replacement,
+                limit),
+            Selection.ROULETTE_WHEEL.value: lambda: population.roulette_wheel_selection(
+                self.config.percent_of_selected, self.config.selection_weighting, limit),
+            Selection.STOCHASTIC_UNIVERSAL.value: lambda: population.stochastic_universal_selection(
+                self.config.percent_of_selected, self.config.selection_weighting, limit)
+        }[self.config.selection]()
+
+    def checkpoint_due(self, epoch, last_checkpoint_time):
+        return (self.config.checkpoint_interval is not None and epoch % self.config.checkpoint_interval == 0) or \
+            (self.config.checkpoint_seconds is not None and
+             time.time() - last_checkpoint_time >= self.config.checkpoint_seconds)
+
+    def save_checkpoint(self, population, epoch):
+        # Everything needed to continue exactly like the run would without interruption
+        save_checkpoint(self.checkpoint_path, {
+            'epoch': epoch,
+            'epochs': self.epochs,
+            'evaluations': self.objective.evaluations,
+            'population': population.state(),
+            'history': {name: np.array(values) for name, values in self.history.items()},
+            'metrics': self.metrics.state(),
+            'termination': self.termination.state(),
+            **({'fitness_cache': self.fitness_cache.state()} if self.fitness_cache is not None else {}),
+            **random_state(self.rng)
+        })
+
+    def restore_checkpoint(self, population, checkpoint):
+        # Population is restored first, creating members draws random numbers
+        population.restore(checkpoint['population'])
+        self.epochs = int(checkpoint['epochs'])
+        self.objective.evaluations = int(checkpoint['evaluations'])
+        self.history = {name: values.tolist() for name, values in checkpoint.get('history', {}).items()}
+        self.termination.restore(checkpoint['termination'])
+        if self.fitness_cache is not None and 'fitness_cache' in checkpoint:
+            self.fitness_cache.restore(checkpoint['fitness_cache'])
+        restore_random_state(self.rng, checkpoint)
+
+
+class BinaryAlgorithm(PopulationAlgorithm):
+    def __init__(self, config: Config):
+        super().__init__(config)
+
+    def create_population(self):
+        return PopulationBinary(
+            self.config.interval,
+            self.config.chromosome_precision,
+            self.config.chromosome_type,
+            self.config.population_size,
+            self.config.optimization,
+            self.objective,
+            self.fitness_cache,
+            self.config.genes_number,
+            self.rng,
+            self.profiler
+        )
+
+    def evolve(self, population):
+        # Chosen elite members
+        with self.stage(Stage.ELITE):
             elite_members = population.elite_strategy(self.config.percent_of_elite)
 
-            # Selection
-            {
-                Selection.BEST.value: lambda: population.best_selection(self.config.percent_of_selected),
-                Selection.TOURNAMENT.value: lambda: population.tournament_selection(self.config.percent_of_selected),
-                Selection.ROULETTE_WHEEL.value: lambda: population.roulette_wheel_selection(self.config.percent_of_selected)
-            }[self.config.selection]()
+        # Selection
+        with self.stage(Stage.SELECTION):
+            self.select(population, len(elite_members))
 
-            # Crossover
+        # Crossover, masks are built for a whole batch of parent pairs at once
+        with self.stage(Stage.CROSSOVER):
             children = []
-            while len(population.members) + len(children) + len(elite_members) < population.size:
-                parents = random.sample(population.members + elite_members, 2)
+            missing_members_nr = population.size - len(population.members) - len(elite_members)
+            parents_pool = population.members + elite_members
+            while len(children) < missing_members_nr:
+                # Every pair gives two children
+                first, second = random_pairs(self.rng, len(parents_pool),
+                                             math.ceil((missing_members_nr - len(children)) / 2))
+                parents1, parents2 = [parents_pool[idx] for idx in first], [parents_pool[idx] for idx in second]
                 children += {
-                    BinaryCrossover.SINGLE_POINT.value: lambda: population.multipoint_crossover(parents[0], parents[1], self.config.crossover_probability, 1),
-                    BinaryCrossover.TWO_POINT.value: lambda: population.multipoint_crossover(parents[0], parents[1], self.config.crossover_probability, 2),
-                    BinaryCrossover.THREE_POINT.value: lambda: population.multipoint_crossover(parents[0], parents[1], self.config.crossover_probability, 3),
-                    BinaryCrossover.HOMOGENEOUS.value: lambda: population.homogeneous_crossover(parents[0], parents[1], self.config.crossover_probability)
+                    BinaryCrossover.SINGLE_POINT.value: lambda: population.multipoint_crossover(parents1, parents2, self.config.crossover_probability, 1),
+                    BinaryCrossover.TWO_POINT.value: lambda: population.multipoint_crossover(parents1, parents2, self.config.crossover_probability, 2),
+                    BinaryCrossover.THREE_POINT.value: lambda: population.multipoint_crossover(parents1, parents2, self.config.crossover_probability, 3),
+                    BinaryCrossover.HOMOGENEOUS.value: lambda: population.homogeneous_crossover(parents1, parents2, self.config.crossover_probability)
                 }[self.config.crossover]()
 
             # Because we always add two children, sometimes there are too many members
-            if len(population.members) + len(children) + len(elite_members) > population.size:
-                children.pop()
-
-            population.members += children
-
-            # Mutation
-            for i in range(len(population.members)):
-                {
-                    BinaryMutation.SINGLE_POINT.value: lambda: population.multipoint_mutation(population.members[i], self.config.mutation_probability, 1),
-                    BinaryMutation.TWO_POINT.value: lambda: population.multipoint_mutation(population.members[i], self.config.mutation_probability, 2),
-                    BinaryMutation.BOUNDARY.value: lambda: population.boundary_mutation(population.members[i], self.config.mutation_probability)
-                }[self.config.mutation]()
-
-            # Inversion
-            for i in range(len(population.members)):
-                population.inversion(population.members[i], self.config.inversion_probability)
-
-            # Adding elite member
-            population.members += elite_members
+            population.members += children[:max(missing_members_nr, 0)]
 
-        fitness_values = [member.fitness_value for member in population.members]
-
-        self.epoch_best_members.append(copy.deepcopy(sorted(population.members,
-                                                            key=cmp_to_key(compare_members),
-                                                            reverse=OptimizationType.MAXIMIZATION.value == population.optimization)[0]))
-        self.epoch_average.append(mean(fitness_values))
-        self.epoch_standard_deviation.append(stdev(fitness_values))
-
-        # Calculating execution time
-        execution_time = round(time.time() - start_time, 2)
-
-        # Writing program solution tu file
-        self.write_to_file()
+        # Mutation, one mask for whole population
+        with self.stage(Stage.MUTATION):
+            {
+                BinaryMutation.SINGLE_POINT.value: lambda: population.multipoint_mutation(self.config.mutation_probability, 1),
+                BinaryMutation.TWO_POINT.value: lambda: population.multipoint_mutation(self.config.mutation_probability, 2),
+                BinaryMutation.BOUNDARY.value: lambda: population.boundary_mutation(self.config.mutation_probability)
+            }[self.config.mutation]()
 
-        # Creating plots
-        self.create_plots()
+        # Inversion
+        with self.stage(Stage.INVERSION):
+            population.inversion(self.config.inversion_probability)
 
-        solution = self.epoch_best_members[-1]
-        tk.messagebox.showinfo("Solution found",
-                               f"Solution found in {execution_time} seconds.\n"
-                               f"f({round(solution.chromosomes[0].calculate_value(), 10)}, "
-                               f"{round(solution.chromosomes[1].calculate_value(), 10)}) = "
-                               f"{round(solution.fitness_value, 10)}")
+        # Adding elite member
+        population.members += elite_members
+        population.next_generation()
 
 
-class RealAlgorithm(Algorithm):
+class RealAlgorithm(PopulationAlgorithm):
     def __init__(self, config: Config):
         super().__init__(config)
 
-    def start(self):
-        # Start time execution
-        start_time = time.time()
-
-        population = PopulationReal(
-                self.config.interval,
-                self.config.chromosome_precision,
-                self.config.chromosome_type,
-                self.config.population_size,
-                self.config.optimization
-            )
-
-        # Loop
-        for _ in range(self.config.epoch_amount):
-            fitness_values = [member.fitness_value for member in population.members]
-
-            self.epoch_best_members.append(copy.deepcopy(sorted(population.members,
-                                                                key=cmp_to_key(compare_members),
-                                                                reverse=OptimizationType.MAXIMIZATION.value == population.optimization)[0]))
-            self.epoch_average.append(mean(fitness_values))
-            self.epoch_standard_deviation.append(stdev(fitness_values))
-
-            # Chosen elite members
+    def create_population(self):
+        return PopulationReal(
+            self.config.interval,
+            self.config.chromosome_precision,
+            self.config.chromosome_type,
+            self.config.population_size,
+            self.config.optimization,
+            self.objective,
+            self.fitness_cache,
+            self.config.genes_number,
+            self.rng,
+            self.profiler
+        )
+
+    def evolve(self, population):
+        # Chosen elite members
+        with self.stage(Stage.ELITE):
             elite_members = population.elite_strategy(self.config.percent_of_elite)
 
-            # Selection
-            {
-                Selection.BEST.value: lambda: population.best_selection(self.config.percent_of_selected),
-                Selection.TOURNAMENT.value: lambda: population.tournament_selection(self.config.percent_of_selected),
-                Selection.ROULETTE_WHEEL.value: lambda: population.roulette_wheel_selection(self.config.percent_of_selected)
-            }[self.config.selection]()
+        # Selection
+        with self.stage(Stage.SELECTION):
+            self.select(population, len(elite_members))
 
-            # Crossover
+        # Crossover
+        with self.stage(Stage.CROSSOVER):
             children = []
+            parents_pool = population.members + elite_members
             while len(population.members) + len(children) + len(elite_members) < population.size:
-                parents = random.sample(population.members + elite_members, 2)
+                first, second = random_pairs(self.rng, len(parents_pool), 1)
+                parents = parents_pool[first[0]], parents_pool[second[0]]
                 children += {
                     RealCrossover.ARITHMETIC.value: lambda: population.arithmetic_crossover(parents[0], parents[1], self.config.crossover_probability),
-                    RealCrossover.BLEND_ALPHA.value: lambda: population.blend_crossover(parents[0], parents[1], self.config.crossover_probability, self.config.alpha),
-                    RealCrossover.BLEND_ALPHA_BETA.value: lambda: population.blend_crossover(parents[0], parents[1], self.config.crossover_probability, self.config.alpha, self.config.beta),
+                    RealCrossover.BLEND_ALPHA.value: lambda: population.blend_crossover(parents[0], parents[1], self.config.crossover_probability, self.config.alpha, bound_handling=self.config.bound_handling),
+                    RealCrossover.BLEND_ALPHA_BETA.value: lambda: population.blend_crossover(parents[0], parents[1], self.config.crossover_probability, self.config.alpha, self.config.beta, self.config.bound_handling),
                     RealCrossover.AVERAGE.value: lambda: population.average_crossover(parents[0], parents[1], self.config.crossover_probability),
-                    RealCrossover.LINEAR.value: lambda: population.linear_crossover(parents[0], parents[1], self.config.crossover_probability)
+                    RealCrossover.LINEAR.value: lambda: population.linear_crossover(parents[0], parents[1], self.config.crossover_probability, self.config.bound_handling)
                 }[self.config.crossover]()
 
             # Because we always add two children, sometimes there are too many members
-            if len(population.members) + len(children) + len(elite_members) > population.size:
-                children.pop()
-
-            population.members += children
+            population.members += children[:max(population.size - len(population.members) - len(elite_members), 0)]
 
-            # Mutation
+        # Mutation
+        with self.stage(Stage.MUTATION):
             for i in range(len(population.members)):
                 {
                     RealMutation.UNIFORM.value: lambda: population.uniform_mutation(population.members[i], self.config.mutation_probability),
                     RealMutation.GAUSS.value: lambda: population.gauss_mutation(population.members[i], self.config.mutation_probability)
                 }[self.config.mutation]()
 
-            # Adding elite member
-            population.members += elite_members
+        # Adding elite member
+        population.members += elite_members
+        population.next_generation()
 
-        fitness_values = [member.fitness_value for member in population.members]
 
-        self.epoch_best_members.append(copy.deepcopy(sorted(population.members,
-                                                            key=cmp_to_key(compare_members),
-                                                            reverse=OptimizationType.MAXIMIZATION.value == population.optimization)[0]))
-        self.epoch_average.append(mean(fitness_values))
-        self.epoch_standard_deviation.append(stdev(fitness_values))
+class BinaryArrayAlgorithm(PopulationAlgorithm):
+    def __init__(self, config: Config):
+        super().__init__(config)
 
-        # Calculating execution time
-        execution_time = round(time.time() - start_time, 2)
+    def create_population(self):
+        return ArrayPopulationBinary(
+            self.config.interval,
+            self.config.chromosome_precision,
+            self.config.population_size,
+            self.config.optimization,
+            self.objective,
+            self.fitness_cache,
+            self.config.genes_number,
+            self.rng,
+            self.profiler
+        )
+
+    def evolve(self, population):
+        # Chosen elite members
+        with self.stage(Stage.ELITE):
+            elite_genotypes, elite_fitness_values = population.elite_strategy(self.config.percent_of_elite)
+
+        # Selection
+        with self.stage(Stage.SELECTION):
+            self.select(population, elite_genotypes.shape[0])
+
+        # Crossover
+        with self.stage(Stage.CROSSOVER):
+            population.breed(elite_genotypes, {
+                BinaryCrossover.SINGLE_POINT.value: lambda p1, p2: population.multipoint_crossover(p1, p2, self.config.crossover_probability, 1),
+                BinaryCrossover.TWO_POINT.value: lambda p1, p2: population.multipoint_crossover(p1, p2, self.config.crossover_probability, 2),
+                BinaryCrossover.THREE_POINT.value: lambda p1, p2: population.multipoint_crossover(p1, p2, self.config.crossover_probability, 3),
+                BinaryCrossover.HOMOGENEOUS.value: lambda p1, p2: population.homogeneous_crossover(p1, p2, self.config.crossover_probability)
+            }[self.config.crossover])
+
+        # Mutation
+        with self.stage(Stage.MUTATION):
+            {
+                BinaryMutation.SINGLE_POINT.value: lambda: population.multipoint_mutation(self.config.mutation_probability, 1),
+                BinaryMutation.TWO_POINT.value: lambda: population.multipoint_mutation(self.config.mutation_probability, 2),
+                BinaryMutation.BOUNDARY.value: lambda: population.boundary_mutation(self.config.mutation_probability)
+            }[self.config.mutation]()
+
+        # Inversion
+        with self.stage(Stage.INVERSION):
+            population.inversion(self.config.inversion_probability)
+
+        # Adding elite members
+        population.extend(elite_genotypes, elite_fitness_values)
+
+
+class RealArrayAlgorithm(PopulationAlgorithm):
+    def __init__(self, config: Config):
+        super().__init__(config)
+
+    def create_population(self):
+        return ArrayPopulationReal(
+            self.config.interval,
+            self.config.chromosome_precision,
+            self.config.population_size,
+            self.config.optimization,
+            self.objective,
+            self.fitness_cache,
+            self.config.genes_number,
+            self.rng,
+            self.profiler
+        )
+
+    def evolve(self, population):
+        # Chosen elite members
+        with self.stage(Stage.ELITE):
+            elite_genotypes, elite_fitness_values = population.elite_strategy(self.config.percent_of_elite)
+
+        # Selection
+        with self.stage(Stage.SELECTION):
+            self.select(population, elite_genotypes.shape[0])
+
+        # Crossover
+        with self.stage(Stage.CROSSOVER):
+            population.breed(elite_genotypes, {
+                RealCrossover.ARITHMETIC.value: lambda p1, p2: population.arithmetic_crossover(p1, p2, self.config.crossover_probability),
+                RealCrossover.BLEND_ALPHA.value: lambda p1, p2: population.blend_crossover(p1, p2, self.config.crossover_probability, self.config.alpha, bound_handling=self.config.bound_handling),
+                RealCrossover.BLEND_ALPHA_BETA.value: lambda p1, p2: population.blend_crossover(p1, p2, self.config.crossover_probability, self.config.alpha, self.config.beta, self.config.bound_handling),
+                RealCrossover.AVERAGE.value: lambda p1, p2: population.average_crossover(p1, p2, self.config.crossover_probability),
+                RealCrossover.LINEAR.value: lambda p1, p2: population.linear_crossover(p1, p2, self.config.crossover_probability, self.config.bound_handling)
+            }[self.config.crossover])
+
+        # Mutation
+        with self.stage(Stage.MUTATION):
+            {
+                RealMutation.UNIFORM.value: lambda: population.uniform_mutation(self.config.mutation_probability),
+                RealMutation.GAUSS.value: lambda: population.gauss_mutation(self.config.mutation_probability)
+            }[self.config.mutation]()
+
+        # Adding elite members
+        population.extend(elite_genotypes, elite_fitness_values)
+
+
+def create_algorithm(config: Config):
+    if config.islands_number > 1:
+        from src.algorithm.island import IslandAlgorithm
+        return IslandAlgorithm(config)
+
+    if ChromosomeType.BINARY == config.chromosome_type:
+        return BinaryArrayAlgorithm(config) if PopulationEngine.ARRAY.value == config.population_engine \
+            else BinaryAlgorithm(config)
+    elif ChromosomeType.REAL == config.chromosome_type:
+        return RealArrayAlgorithm(config) if PopulationEngine.ARRAY.value == config.population_engine \
+            else RealAlgorithm(config)
 
-        # Writing program solution tu file
-        self.write_to_file()
 
-        # Creating plots
-        self.create_plots()
+def run(config) -> Result:
+    # Headless entry point, config is a Config, a dict of options or a path to JSON / TOML file
+    if isinstance(config, (str, os.PathLike)):
+        config = load_config(config)
+    if isinstance(config, dict):
+        config = Config().from_dict(config)
 
-        solution = self.epoch_best_members[-1]
-        tk.messagebox.showinfo("Solution found",
-                               f"Solution found in {execution_time} seconds.\n"
-                               f"f({round(solution.chromosomes[0].calculate_value(), 10)}, "
-                               f"{round(solution.chromosomes[1].calculate_value(), 10)}) = "
-                               f"{round(solution.fitness_value, 10)}")
+    return create_algorithm(config).start()
@@ -0,0 +1,55 @@
+import json
+import os
+import numpy as np
+
+SEPARATOR = '/'
+
+
+# Nested dict of arrays and scalars is kept as one uncompressed .npz file, names are joined with separator
+def flatten(state: dict, prefix=''):
+    flat = {}
+    for name, value in state.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{name}{SEPARATOR}'))
+        else:
+            flat[prefix + name] = value
+
+    return flat
+
+
+def unflatten(flat: dict):
+    state = {}
+    for path, value in flat.items():
+        *names, name = path.split(SEPARATOR)
+        node = state
+        for parent in names:
+            node = node.setdefault(parent, {})
+        node[name] = value
+
+    return state
+
+
+def random_state(rng):
+    # Bit generator state holds 128-bit integers, it is kept as JSON text
+    return {'rng': np.array(json.dumps(rng.bit_generator.state))}
+
+
+def restore_random_state(rng, state: dict):
+    rng.bit_generator.state = json.loads(str(state['rng']))
+
+
+def save_checkpoint(path, state: dict):
+    # Written to temporary file first and renamed, so a killed run always leaves a complete checkpoint
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary_path = path + '.tmp'
+
+    with open(temporary_path, 'wb') as f:
+        np.savez(f, **flatten(state))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path):
+    with np.load(path) as data:
+        return unflatten({name: data[name] for name in data.files})
@@ -1,4 +1,7 @@
+import json
+import os
 from enum import Enum
+from src.models.chromosome import ChromosomeType
 
 binary_default_values = [60, 0.5, 0.02, 0, 10, -10, 10, 6, 100, 1000]
 real_default_values = [60, 0.5, 0.02, 10, 0, 0, -10, 10, 100, 1000]
@@ -27,9 +30,15 @@ class RealCrossover(Enum):
 class Selection(Enum):
     BEST = 'best'
     ROULETTE_WHEEL = 'roulette-wheel'
+    STOCHASTIC_UNIVERSAL = 'stochastic-universal'
     TOURNAMENT = 'tournament'
 
 
+class SelectionWeighting(Enum):
+    FITNESS = 'fitness'
+    RANK = 'rank'
+
+
 class BinaryMutation(Enum):
     BOUNDARY = 'boundary'
     SINGLE_POINT = 'single-point'
@@ -69,51 +78,201 @@ class RealVariables(Enum):
     EPOCH_AMOUNT = 'epoch amount:'
 
 
+class Objective(Enum):
+    BOOTH = 'Booth'
+    RASTRIGIN = 'Rastrigin'
+    ROSENBROCK = 'Rosenbrock'
+    ACKLEY = 'Ackley'
+    SPHERE = 'Sphere'
+
+
+class PopulationEngine(Enum):
+    OBJECT = 'object'
+    ARRAY = 'array'
+
+
+class EvaluationBackend(Enum):
+    SERIAL = 'serial'
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
+class BoundHandling(Enum):
+    REJECT = 'reject'  # Blend children are drawn again, linear children outside interval are dropped
+    TRUNCATE = 'truncate'  # Blend children are drawn from the part of blend range inside interval, blend only
+    CLIP = 'clip'
+    REFLECT = 'reflect'
+
+
+class MetricsFormat(Enum):
+    CSV = 'csv'
+    NPY = 'npy'
+
+
+class Statistic(Enum):
+    MEAN = 'mean'
+    STDEV = 'stdev'
+    WORST = 'worst'
+    MEDIAN = 'median'
+    QUANTILES = 'quantiles'
+    DIVERSITY = 'diversity'  # Mean pairwise Hamming distance for binary, mean per-gene variance for real
+
+
+class StopReason(Enum):
+    EPOCH_AMOUNT = 'epoch-amount'
+    TARGET_FITNESS = 'target-fitness'
+    STAGNATION = 'stagnation'
+    CONVERGENCE = 'convergence'
+    MAX_EVALUATIONS = 'max-evaluations'
+    TIME_BUDGET = 'time-budget'
+
+
+class MigrationTopology(Enum):
+    RING = 'ring'
+    FULLY_CONNECTED = 'fully-connected'
+    RANDOM = 'random'
+
+
+class Stage(Enum):
+    ELITE = 'elite'
+    SELECTION = 'selection'
+    CROSSOVER = 'crossover'
+    MUTATION = 'mutation'
+    INVERSION = 'inversion'
+    EVALUATION = 'evaluation'  # Objective calls, wherever in epoch they happen
+    STATISTICS = 'statistics'
+    METRICS = 'metrics'
+    CHECKPOINT = 'checkpoint'
+
+
 class GenOperators(Enum):
     OPTIMIZATION = 'optimization'
     SELECTION = 'selection'
     MUTATION = 'mutation'
     CROSSOVER = 'crossover'
+    ENGINE = 'engine'
+    OBJECTIVE = 'objective'
+
+
+def parse_chromosome_type(chromosome_type):
+    # Chromosome type is given either by its value or by name, e.g. 'binary'
+    if not isinstance(chromosome_type, str):
+        return chromosome_type
 
+    return ChromosomeType(chromosome_type) if chromosome_type in [e.value for e in ChromosomeType] \
+        else ChromosomeType[chromosome_type.upper()]
 
-class Singleton(type):
-    _instances = {}
 
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+default_statistics = (Statistic.MEAN.value, Statistic.STDEV.value)
 
 
-class Config(metaclass=Singleton):
+# Plain value object, every run has its own config and it can be pickled to worker processes
+class Config:
     def __init__(self):
         # optimization
         self.optimization = None
+        self.objective = Objective.BOOTH.value
         # chromosome config
-        self.interval = None
+        self.interval = None  # [a, b] shared by all genes or one [a, b] per gene
+        self.genes_number = 2  # Dimension of objective
         self.chromosome_type = None
         # population config
         self.population_size = None
+        self.population_engine = PopulationEngine.OBJECT.value
         # algorithm config
         self.epoch_amount = None
         self.crossover = None
         self.crossover_probability = None
         self.selection = None
         self.percent_of_selected = None
+        self.tournaments_number = None  # Every member takes part in one tournament by default, at most size - elite
+        self.tournament_replacement = False
+        self.selection_weighting = SelectionWeighting.FITNESS.value  # Roulette wheel and stochastic universal
         self.mutation = None
         self.mutation_probability = None
         self.percent_of_elite = None
+        # early stopping, every criterion is disabled by default and the first one met stops run
+        self.target_fitness = None
+        self.stagnation_epochs = None  # Epochs without improvement of best fitness value
+        self.stdev_threshold = None
+        self.max_evaluations = None
+        self.time_budget = None  # Seconds
+        # fitness evaluation
+        self.evaluation_backend = EvaluationBackend.SERIAL.value
+        self.evaluation_workers = None  # Number of CPUs by default
+        self.evaluation_chunk_size = None  # Four chunks per worker by default
+        self.fitness_cache_size = 0  # Fitness cache is disabled by default
+        self.fitness_cache_decimals = 10
+        # island model
+        self.islands_number = 1  # Island model is disabled by default, population_size is per island
+        self.migration_interval = 10  # Epochs between migrations
+        self.migration_rate = 0.1  # Part of island population sent to other islands
+        self.migration_topology = MigrationTopology.RING.value
         # real representation
         self.alpha = None
         self.beta = None
+        self.bound_handling = BoundHandling.REJECT.value  # Blend and linear crossover children outside interval
         # binary representation
         self.chromosome_precision = None
         self.inversion_probability = None
+        # output
+        self.output_dir = None  # output folder in working directory by default
+        self.metrics_format = MetricsFormat.CSV.value
+        self.metrics_flush_interval = 100  # Epochs between writes of metrics to disk
+        self.keep_history = True  # Epoch history kept in memory too, for plots and GUI
+        # epoch statistics, best member is always recorded
+        self.statistics = list(default_statistics)
+        self.statistics_quantiles = [0.25, 0.75]  # Levels of 'quantiles' statistic
+        # checkpoints, disabled unless interval in epochs or in seconds is set
+        self.checkpoint_interval = None
+        self.checkpoint_seconds = None
+        self.checkpoint_path = None  # checkpoint.npz in output folder by default
+        self.resume = False  # Continue from checkpoint when it exists
+        # profiling, per-stage timers and counters, nothing is measured when disabled
+        self.profile = False
+        self.profile_path = None  # profile.json in output folder by default
+        # random number generators are not seeded by default
+        self.seed = None
+
+    def from_dict(self, options: dict):
+        for name, value in options.items():
+            if name not in vars(self):
+                raise ValueError(f"Unknown config option: {name}")
+            setattr(self, name, value)
+
+        self.chromosome_type = parse_chromosome_type(self.chromosome_type)
+        if self.interval is not None:
+            self.interval = [[float(endpoint) for endpoint in gene_interval] if isinstance(gene_interval, (list, tuple))
+                             else float(gene_interval) for gene_interval in self.interval]
+
+        missing = [name for name in self.required_options() if getattr(self, name) is None]
+        if len(missing) > 0:
+            raise ValueError(f"Missing config options: {', '.join(missing)}")
+        return self
+
+    def to_dict(self):
+        options = dict(vars(self))
+        options['chromosome_type'] = self.chromosome_type.value if self.chromosome_type is not None else None
+        return options
+
+    def required_options(self):
+        required = ['optimization', 'interval', 'chromosome_type', 'population_size', 'epoch_amount', 'crossover',
+                    'crossover_probability', 'selection', 'percent_of_selected', 'mutation', 'mutation_probability',
+                    'percent_of_elite']
+        if ChromosomeType.BINARY == self.chromosome_type:
+            required += ['chromosome_precision', 'inversion_probability']
+        elif ChromosomeType.REAL == self.chromosome_type:
+            required += ['alpha', 'beta']
+        return required
 
     def with_optimization(self, optimization):
         self.optimization = optimization.get()
         return self
 
+    def with_objective(self, objective):
+        self.objective = objective.get()
+        return self
+
     def with_crossover(self, crossover, probability):
         self.crossover = crossover.get()
         self.crossover_probability = float(probability.get())
@@ -153,6 +312,10 @@ class Config(metaclass=Singleton):
         self.population_size = int(population_size.get())
         return self
 
+    def with_population_engine(self, population_engine):
+        self.population_engine = population_engine.get()
+        return self
+
     def with_epoch_amount(self, epoch_amount):
         self.epoch_amount = int(epoch_amount.get())
         return self
@@ -165,3 +328,17 @@ class Config(metaclass=Singleton):
         self.beta = float(beta.get())
         return self
 
+
+def load_config(path):
+    # Plain options of Config read from JSON or TOML file
+    extension = os.path.splitext(path)[1].lower()
+    if '.toml' == extension:
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            raise ValueError("Reading TOML config requires Python 3.11 or newer")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,102 @@
+import math
+import os
+import numpy as np
+from collections import OrderedDict
+from src.algorithm.conf import EvaluationBackend, Stage
+
+
+class Evaluator:
+    def __init__(self, objective, backend=EvaluationBackend.SERIAL.value, workers=None, chunk_size=None):
+        self.objective = objective
+        self.backend = backend
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.chunk_size = chunk_size
+        self.executor = None
+        self.evaluations = 0  # Number of genotypes passed to objective
+        self.profiler = None  # Set by algorithm when profiling is enabled
+
+    def __call__(self, values):
+        if self.profiler is None:
+            return self.evaluate(values)
+
+        with self.profiler.stage(Stage.EVALUATION.value):
+            return self.evaluate(values)
+
+    def evaluate(self, values):
+        self.evaluations += values.shape[0]
+        if EvaluationBackend.SERIAL.value == self.backend or values.shape[0] == 0:
+            return self.objective(values)
+
+        if self.executor is None:
+            # Imported only when needed, process pool pulls in multiprocessing
+            from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+            self.executor = {
+                EvaluationBackend.THREAD.value: ThreadPoolExecutor,
+                EvaluationBackend.PROCESS.value: ProcessPoolExecutor
+            }[self.backend](max_workers=self.workers)
+
+        chunk_size = self.chunk_size if self.chunk_size is not None \
+            else math.ceil(values.shape[0] / (self.workers * 4))
+        chunks = [values[idx:idx + chunk_size] for idx in range(0, values.shape[0], chunk_size)]
+
+        # map keeps the order of chunks, so results do not depend on the number of workers
+        return np.concatenate(list(self.executor.map(self.objective, chunks)))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+class FitnessCache:
+    def __init__(self, capacity, decimals=10):
+        self.capacity = capacity
+        self.decimals = decimals  # Real genotypes are rounded to this many decimals before lookup
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def keys(self, values):
+        return [row.tobytes() for row in np.round(values, self.decimals)]
+
+    def evaluate(self, keys, values, objective):
+        fitness_values = np.empty(len(keys))
+        missing = {}  # Genotype key -> indices of members waiting for its evaluation
+
+        for idx, key in enumerate(keys):
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                fitness_values[idx] = self.entries[key]
+                self.hits += 1
+            elif key in missing:
+                missing[key].append(idx)
+                self.hits += 1
+            else:
+                missing[key] = [idx]
+                self.misses += 1
+
+        if len(missing) > 0:
+            indices = [indices[0] for indices in missing.values()]
+            for (key, indices), fitness_value in zip(missing.items(), objective(values[indices])):
+                fitness_values[indices] = fitness_value
+                self.store(key, fitness_value)
+
+        return fitness_values
+
+    def store(self, key, fitness_value):
+        self.entries[key] = fitness_value
+        if len(self.entries) > self.capacity:
+            # Evicting least recently used genotype
+            self.entries.popitem(last=False)
+
+    def state(self):
+        # Keys of one run have the same length, so entries are kept as one byte matrix, least recently used first
+        keys = np.array([np.frombuffer(key, dtype=np.uint8) for key in self.entries], dtype=np.uint8) \
+            if len(self.entries) > 0 else np.empty((0, 0), dtype=np.uint8)
+        return {'keys': keys, 'values': np.array(list(self.entries.values()), dtype=float),
+                'hits': self.hits, 'misses': self.misses}
+
+    def restore(self, state):
+        self.entries = OrderedDict((key.tobytes(), float(value)) for key, value in zip(state['keys'], state['values']))
+        self.hits = int(state['hits'])
+        self.misses = int(state['misses'])
@@ -0,0 +1,186 @@
+import copy
+import math
+import multiprocessing
+import time
+import numpy as np
+from src.algorithm.algorithm import Algorithm, create_algorithm
+from src.algorithm.conf import Config, MigrationTopology, Statistic
+from src.utils import utils
+
+
+def migration_sources(topology: str, islands_number: int, rng):
+    # Islands sending their emigrants to each island
+    return {
+        MigrationTopology.RING.value: lambda: [[(idx - 1) % islands_number] for idx in range(islands_number)],
+        MigrationTopology.FULLY_CONNECTED.value: lambda: [[source for source in range(islands_number) if source != idx]
+                                                          for idx in range(islands_number)],
+        MigrationTopology.RANDOM.value: lambda: [[(idx + offset) % islands_number] for idx, offset in
+                                                 enumerate(rng.integers(1, islands_number, size=islands_number).tolist())]
+    }[topology]()
+
+
+def receive(connection):
+    # Island errors are sent back and raised in the main process
+    message = connection.recv()
+    if isinstance(message, Exception):
+        raise message
+    return message
+
+
+def run_island(config: Config, migrants_number: int, connection):
+    # One island in its own process, every migration_interval epochs best members are sent away
+    # and the same number of immigrants is received
+    algorithm = None
+    try:
+        algorithm = create_algorithm(config)
+        population = algorithm.create_population()
+
+        for epoch in range(1, config.epoch_amount + 1):
+            algorithm.save_epoch(population)
+            algorithm.evolve(population)
+
+            if epoch % config.migration_interval == 0 and epoch < config.epoch_amount:
+                connection.send(population.emigrants(migrants_number))
+                population.immigrate(*receive(connection))
+
+        algorithm.save_epoch(population)
+
+        connection.send({
+            'history': algorithm.history,
+            'evaluations': algorithm.evaluations,
+            'cache_hits': algorithm.fitness_cache.hits if algorithm.fitness_cache is not None else 0,
+            'cache_misses': algorithm.fitness_cache.misses if algorithm.fitness_cache is not None else 0,
+            'profile': algorithm.profiler.to_dict() if algorithm.profiler is not None else None
+        })
+    except Exception as e:
+        connection.send(e)
+    finally:
+        # Evaluation workers are stopped on error too
+        if algorithm is not None:
+            algorithm.objective.close()
+        connection.close()
+
+
+# Island model, islands_number populations evolve in separate processes and exchange migrants
+class IslandAlgorithm(Algorithm):
+    def __init__(self, config: Config):
+        if config.checkpoint_interval is not None or config.checkpoint_seconds is not None or config.resume:
+            raise ValueError("Checkpoints are not supported with island model")
+        if any(criterion is not None for criterion in (config.target_fitness, config.stagnation_epochs,
+                                                       config.stdev_threshold, config.max_evaluations,
+                                                       config.time_budget)):
+            raise ValueError("Early stopping is not supported with island model")
+
+        super().__init__(config)
+        self.islands_number = config.islands_number
+        self.migrants_number = min(max(math.ceil(config.population_size * config.migration_rate), 1),
+                                   config.population_size)
+        self.island_evaluations = 0
+
+    @property
+    def evaluations(self):
+        return self.island_evaluations
+
+    def island_configs(self, seeds):
+        configs = []
+        for seed in seeds:
+            config = copy.copy(self.config)
+            config.islands_number = 1
+            config.keep_history = True  # Histories are merged when all islands finish
+            if Statistic.STDEV.value in config.statistics and Statistic.MEAN.value not in config.statistics:
+                config.statistics = config.statistics + [Statistic.MEAN.value]  # Needed for pooled stdev
+            config.seed = seed  # Spawned SeedSequence, independent stream for every island
+            configs.append(config)
+
+        return configs
+
+    def immigrants(self, emigrants):
+        # Emigrants from all sources, only best migrants_number of them are sent to the island
+        genotypes = np.concatenate([genotypes for genotypes, _ in emigrants])
+        fitness_values = np.concatenate([fitness_values for _, fitness_values in emigrants])
+        best_indices = utils.best_indices(utils.ranking_keys(fitness_values, self.config.optimization),
+                                          self.migrants_number)
+
+        return genotypes[best_indices], fitness_values[best_indices]
+
+    def start(self):
+        # Start time execution
+        start_time = time.time()
+
+        # Every island has its own seed, last one drives random topology
+        seeds = np.random.SeedSequence(self.config.seed).spawn(self.islands_number + 1)
+        rng = np.random.default_rng(seeds[-1])
+
+        connections, processes = [], []
+        try:
+            for config in self.island_configs(seeds[:-1]):
+                connection, island_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=run_island,
+                                                  args=(config, self.migrants_number, island_connection))
+                process.start()
+                island_connection.close()
+                connections.append(connection)
+                processes.append(process)
+
+            # Islands wait for their immigrants, so all of them migrate in the same epochs
+            for _ in range((self.config.epoch_amount - 1) // self.config.migration_interval):
+                emigrants = [receive(connection) for connection in connections]
+                sources = migration_sources(self.config.migration_topology, self.islands_number, rng)
+                for connection, island_sources in zip(connections, sources):
+                    connection.send(self.immigrants([emigrants[source] for source in island_sources]))
+
+            histories = [receive(connection) for connection in connections]
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        self.merge_histories(histories)
+        return self.finish(start_time)
+
+    def merge_histories(self, histories):
+        # Best member over all islands, statistics of all islands together
+        island_histories = [history['history'] for history in histories]
+        merged = {name: np.array([history[name] for history in island_histories]) for name in island_histories[0]}
+        epochs = np.arange(merged['fitness_value'].shape[1])
+
+        best_islands = np.argmin(utils.ranking_keys(merged['fitness_value'], self.config.optimization), axis=0)
+        merged['best_values'] = merged['best_values'][best_islands, epochs]
+        merged['fitness_value'] = merged['fitness_value'][best_islands, epochs]
+        if 'worst_fitness_value' in merged:
+            worst_islands = np.argmax(utils.ranking_keys(merged['worst_fitness_value'], self.config.optimization),
+                                      axis=0)
+            merged['worst_fitness_value'] = merged['worst_fitness_value'][worst_islands, epochs]
+        if 'standard_deviation' in merged:
+            # Islands are of equal size, so pooled variance is mean of island variances plus variance of averages
+            merged['standard_deviation'] = np.sqrt(np.mean(merged['standard_deviation'] ** 2 +
+                                                           (merged['average'] - merged['average'].mean(axis=0)) ** 2,
+                                                           axis=0))
+            if Statistic.MEAN.value not in self.config.statistics:
+                del merged['average']
+
+        # Median, quantiles and diversity are averaged over islands
+        for name in merged:
+            if merged[name].ndim == 2 and name != 'best_values':
+                merged[name] = merged[name].mean(axis=0)
+
+        self.island_evaluations = sum(history['evaluations'] for history in histories)
+        if self.fitness_cache is not None:
+            self.fitness_cache.hits += sum(history['cache_hits'] for history in histories)
+            self.fitness_cache.misses += sum(history['cache_misses'] for history in histories)
+
+        # Stage times of all islands together, so hooks see whole run
+        if self.profiler is not None:
+            for history in histories:
+                if history['profile'] is not None:
+                    self.profiler.merge(history['profile'])
+
+        self.open_metrics()
+        try:
+            for epoch in epochs.tolist():
+                self.record_epoch({name: merged[name][epoch].tolist() for name in merged})
+        finally:
+            self.close_metrics()
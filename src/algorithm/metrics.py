@@ -0,0 +1,154 @@
+import csv
+import glob
+import os
+import numpy as np
+from abc import ABC, abstractmethod
+from src.algorithm.conf import MetricsFormat
+
+
+# Per-epoch statistics are appended while the algorithm runs, only scalars and best member values are kept
+class MetricsSink(ABC):
+    def __init__(self, path, flush_interval, state=None):
+        self.path = path
+        self.flush_interval = max(flush_interval, 1)
+        self.epochs = int(state['epochs']) if state is not None else 0
+
+    def write(self, statistics: dict):
+        self.epochs += 1
+        self.append(self.epochs, statistics)
+        if self.epochs % self.flush_interval == 0:
+            self.flush()
+
+    @abstractmethod
+    def append(self, epoch, statistics: dict):
+        pass
+
+    @abstractmethod
+    def flush(self):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    @abstractmethod
+    def state(self):
+        # Everything written is flushed, sink created with this state continues after last written epoch
+        pass
+
+
+class CsvMetricsSink(MetricsSink):
+    def __init__(self, path, flush_interval, state=None):
+        super().__init__(path, flush_interval, state)
+        self.file = None
+        self.writer = None
+
+        # Rows written after the state was taken are dropped
+        if state is not None and self.epochs > 0:
+            self.file = open(self.path, 'r+', newline='')
+            self.file.truncate(int(state['offset']))
+            self.file.seek(0, os.SEEK_END)
+            self.writer = csv.writer(self.file)
+
+    def append(self, epoch, statistics: dict):
+        # Header is written with first row, when number of genes and enabled statistics are known
+        if self.file is None:
+            self.file = open(self.path, 'w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(['Epoch'] + [f'X{idx + 1}' for idx in range(len(statistics['best_values']))] +
+                                 [name.capitalize() for name in statistics if name != 'best_values'])
+
+        self.writer.writerow([epoch, *statistics['best_values'],
+                              *[value for name, value in statistics.items() if name != 'best_values']])
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def state(self):
+        self.flush()
+        return {'epochs': self.epochs, 'offset': self.file.tell() if self.file is not None else 0}
+
+
+# Every flush writes one chunk file with a structured array of rows buffered since the previous one
+class NpyMetricsSink(MetricsSink):
+    def __init__(self, path, flush_interval, state=None):
+        super().__init__(path, flush_interval, state)
+        self.buffer = None
+        self.buffered = 0
+        self.chunks = int(state['chunks']) if state is not None else 0
+
+        # Chunks written after the state was taken are dropped
+        os.makedirs(self.path, exist_ok=True)
+        for chunk_path in glob.glob(os.path.join(self.path, 'metrics_*.npy')):
+            if int(os.path.basename(chunk_path)[8:-4]) >= self.chunks:
+                os.remove(chunk_path)
+
+    def append(self, epoch, statistics: dict):
+        if self.buffer is None:
+            self.buffer = np.empty(self.flush_interval, dtype=metrics_dtype(
+                [name for name in statistics if name != 'best_values'], len(statistics['best_values'])))
+
+        self.buffer[self.buffered] = (epoch, *statistics.values())
+        self.buffered += 1
+
+    def flush(self):
+        if self.buffered == 0:
+            return
+
+        np.save(os.path.join(self.path, f'metrics_{self.chunks:08d}.npy'), self.buffer[:self.buffered])
+        self.chunks += 1
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+
+    def state(self):
+        self.flush()
+        return {'epochs': self.epochs, 'chunks': self.chunks}
+
+
+def metrics_dtype(names, genes_number):
+    # Best member values first, like in statistics of population
+    return np.dtype([('epoch', np.int64), ('best_values', np.float64, (genes_number,))] +
+                    [(name, np.float64) for name in names])
+
+
+def metrics_path(metrics_format: str, output_folder):
+    return os.path.join(output_folder, {
+        MetricsFormat.CSV.value: 'output.csv',
+        MetricsFormat.NPY.value: 'metrics'
+    }[metrics_format])
+
+
+def create_metrics_sink(metrics_format: str, path, flush_interval, state=None):
+    return {
+        MetricsFormat.CSV.value: lambda: CsvMetricsSink(path, flush_interval, state),
+        MetricsFormat.NPY.value: lambda: NpyMetricsSink(path, flush_interval, state)
+    }[metrics_format]()
+
+
+def load_metrics(path):
+    # Rows written by either sink, as one structured array
+    if os.path.isdir(path):
+        chunks = [np.load(chunk_path) for chunk_path in sorted(glob.glob(os.path.join(path, 'metrics_*.npy')))]
+        return np.concatenate(chunks) if len(chunks) > 0 else np.empty(0, dtype=metrics_dtype([], 0))
+
+    with open(path, newline='') as f:
+        header = next(csv.reader(f))
+    genes_number = sum(1 for title in header if title.startswith('X'))
+    names = [title.lower() for title in header[genes_number + 1:]]
+
+    table = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    metrics = np.empty(table.shape[0], dtype=metrics_dtype(names, genes_number))
+    metrics['epoch'] = table[:, 0]
+    metrics['best_values'] = table[:, 1:genes_number + 1]
+    for idx, name in enumerate(names):
+        metrics[name] = table[:, genes_number + 1 + idx]
+
+    return metrics
@@ -0,0 +1,48 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+# Cumulative time of every stage of epoch and counters, created only when profiling is enabled
+class Profiler:
+    def __init__(self):
+        self.times = {}  # Nanoseconds by stage, time of nested stage is not counted in the outer one
+        self.counters = {}
+        self.stack = []
+        self.last_time = None
+
+    def switch(self):
+        # Time since last switch belongs to stage on top of stack
+        now = time.perf_counter_ns()
+        if len(self.stack) > 0:
+            self.times[self.stack[-1]] = self.times.get(self.stack[-1], 0) + now - self.last_time
+        self.last_time = now
+
+    @contextmanager
+    def stage(self, name: str):
+        self.switch()
+        self.stack.append(name)
+        try:
+            yield
+        finally:
+            self.switch()
+            self.stack.pop()
+
+    def count(self, name: str, number=1):
+        self.counters[name] = self.counters.get(name, 0) + int(number)
+
+    def merge(self, profile: dict):
+        # Profile of other process, e.g. an island
+        for name, value in profile['times_ns'].items():
+            self.times[name] = self.times.get(name, 0) + value
+        for name, value in profile['counters'].items():
+            self.count(name, value)
+
+    def to_dict(self):
+        return {'times_ns': dict(self.times), 'counters': dict(self.counters)}
+
+    def dump(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
@@ -0,0 +1,66 @@
+import os
+import sys
+from src.algorithm.metrics import load_metrics
+
+
+def load_pyplot():
+    # Matplotlib is imported only when charts are created, it dominates startup time otherwise
+    import matplotlib
+
+    # Without display (e.g. batch nodes) charts are rendered off screen
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        matplotlib.use('Agg')
+
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def epoch_history(result):
+    # History kept in memory, or read back from metrics file when it was only streamed to disk
+    if len(result.epoch_best_fitness_values) == result.epochs + 1:
+        return result.history
+
+    metrics = load_metrics(result.metrics_path)
+    return {name: metrics[name] for name in metrics.dtype.names}
+
+
+def create_plots(result):
+    plt = load_pyplot()
+    history = epoch_history(result)
+    x = range(1, len(history['fitness_value']) + 1)
+
+    plt.xlabel('Epoch')
+    plt.ylabel('Fitness value')
+    plt.title("Chart of fitness value by epoch")
+
+    plt.plot(x, history['fitness_value'])
+    plt.savefig(os.path.join(result.output_folder, 'fitness_value.png'))
+    plt.cla()
+
+    # Charts of statistics disabled in config are skipped
+    if 'average' in history:
+        plt.xlabel('Epoch')
+        plt.ylabel('Average')
+        plt.title("Chart of average by epoch")
+
+        plt.plot(x, history['average'])
+        plt.savefig(os.path.join(result.output_folder, 'average.png'))
+        plt.cla()
+
+    if 'standard_deviation' in history:
+        plt.xlabel('Epoch')
+        plt.ylabel('Standard deviation')
+        plt.title("Chart of standard deviation by epoch")
+
+        plt.plot(x, history['standard_deviation'])
+        plt.savefig(os.path.join(result.output_folder, 'standard_deviation.png'))
+        plt.cla()
+
+    if 'diversity' in history:
+        plt.xlabel('Epoch')
+        plt.ylabel('Diversity')
+        plt.title("Chart of diversity by epoch")
+
+        plt.plot(x, history['diversity'])
+        plt.savefig(os.path.join(result.output_folder, 'diversity.png'))
+        plt.cla()
@@ -0,0 +1,109 @@
+import csv
+import itertools
+import os
+import numpy as np
+from src.algorithm.algorithm import create_algorithm
+from src.algorithm.conf import Config, Selection, BinaryCrossover, RealCrossover, BinaryMutation, RealMutation, \
+    OptimizationType, Objective, MigrationTopology, load_config, parse_chromosome_type
+from src.models.chromosome import ChromosomeType
+
+ALL_VALUES = '*'
+
+
+def option_values(name, values, chromosome_type):
+    # '*' stands for every value of enum behind the option
+    if ALL_VALUES != values:
+        return values
+
+    binary = ChromosomeType.BINARY == chromosome_type
+    enum = {
+        'optimization': OptimizationType,
+        'objective': Objective,
+        'selection': Selection,
+        'crossover': BinaryCrossover if binary else RealCrossover,
+        'mutation': BinaryMutation if binary else RealMutation,
+        'migration_topology': MigrationTopology
+    }[name]
+    return [e.value for e in enum]
+
+
+def grid(base_options: dict, parameters: dict):
+    chromosome_type = parse_chromosome_type(base_options['chromosome_type'])
+    names = list(parameters)
+    values = [option_values(name, parameters[name], chromosome_type) for name in names]
+
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def random_sample(base_options: dict, parameters: dict, samples: int, seed=None):
+    # Lists are sampled uniformly, {low, high} ranges as uniform floats or integers
+    chromosome_type = parse_chromosome_type(base_options['chromosome_type'])
+    rng = np.random.default_rng(seed)
+    combinations = []
+
+    for _ in range(samples):
+        combination = {}
+        for name, values in parameters.items():
+            if isinstance(values, dict):
+                low, high = values['low'], values['high']
+                combination[name] = int(rng.integers(low, high, endpoint=True)) \
+                    if isinstance(low, int) and isinstance(high, int) else float(rng.uniform(low, high))
+            else:
+                values = option_values(name, values, chromosome_type)
+                combination[name] = values[int(rng.integers(len(values)))]
+        combinations.append(combination)
+
+    return combinations
+
+
+def create_configs(base_options: dict, combinations: list, seed=None, output_dir='output'):
+    # Every run gets its own output folder and its own, independent seed
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(combinations))]
+
+    return [Config().from_dict({**base_options, **combination,
+                                'seed': run_seed,
+                                'output_dir': os.path.join(output_dir, f'run_{idx}')})
+            for idx, (combination, run_seed) in enumerate(zip(combinations, seeds))]
+
+
+def run_config(config: Config):
+    result = create_algorithm(config).start()
+    return {**config.to_dict(), **result.to_dict()}
+
+
+def sweep(base_options: dict, combinations: list, workers=None, seed=None, output_dir='output'):
+    configs = create_configs(base_options, combinations, seed, output_dir)
+
+    if workers == 1:
+        rows = [run_config(config) for config in configs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(run_config, configs))
+
+    write_table(rows, os.path.join(output_dir, 'sweep.csv'))
+    return rows
+
+
+def write_table(rows, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    header = list(dict.fromkeys(name for row in rows for name in row))
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=header)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_sweep_file(path, workers=None, output_dir=None):
+    # Sweep file holds [base] options, [parameters] to sweep and optional samples, seed, workers and output_dir
+    spec = load_config(path)
+    base_options, parameters = spec['base'], spec['parameters']
+
+    combinations = random_sample(base_options, parameters, spec['samples'], spec.get('seed')) \
+        if 'samples' in spec else grid(base_options, parameters)
+
+    return sweep(base_options, combinations,
+                 workers if workers is not None else spec.get('workers'),
+                 spec.get('seed'),
+                 output_dir if output_dir is not None else spec.get('output_dir', 'output'))
@@ -0,0 +1,48 @@
+import time
+from src.algorithm.conf import Config, StopReason, Statistic
+from src.utils.utils import ranking_keys
+
+
+# Early stopping, run stops at the first enabled criterion met after an epoch is recorded
+class Termination:
+    def __init__(self, config: Config):
+        if config.stdev_threshold is not None and Statistic.STDEV.value not in config.statistics:
+            raise ValueError("stdev_threshold needs 'stdev' in statistics")
+
+        self.config = config
+        self.start_time = time.time()
+        self.target_key = ranking_keys([config.target_fitness], config.optimization)[0] \
+            if config.target_fitness is not None else None
+        self.best_key = float('inf')
+        self.stagnant_epochs = 0  # Epochs since best fitness value last improved
+
+    def start(self):
+        self.start_time = time.time()
+
+    def check(self, statistics: dict, evaluations: int):
+        key = ranking_keys([statistics['fitness_value']], self.config.optimization)[0]
+        if key < self.best_key:
+            self.best_key = key
+            self.stagnant_epochs = 0
+        else:
+            self.stagnant_epochs += 1
+
+        if self.target_key is not None and key <= self.target_key:
+            return StopReason.TARGET_FITNESS.value
+        if self.config.stagnation_epochs is not None and self.stagnant_epochs >= self.config.stagnation_epochs:
+            return StopReason.STAGNATION.value
+        if self.config.stdev_threshold is not None and \
+                statistics['standard_deviation'] <= self.config.stdev_threshold:
+            return StopReason.CONVERGENCE.value
+        if self.config.max_evaluations is not None and evaluations >= self.config.max_evaluations:
+            return StopReason.MAX_EVALUATIONS.value
+        if self.config.time_budget is not None and time.time() - self.start_time >= self.config.time_budget:
+            return StopReason.TIME_BUDGET.value
+        return None
+
+    def state(self):
+        return {'best_key': self.best_key, 'stagnant_epochs': self.stagnant_epochs}
+
+    def restore(self, state):
+        self.best_key = float(state['best_key'])
+        self.stagnant_epochs = int(state['stagnant_epochs'])
@@ -0,0 +1,48 @@
+import argparse
+import json
+from src.algorithm.algorithm import run
+from src.algorithm.conf import load_config
+from src.algorithm.report import create_plots
+from src.algorithm.sweep import run_sweep_file
+
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(description="Run genetic algorithm without GUI.")
+    parser.add_argument('config', help="path to JSON or TOML file with config options, or with sweep when --sweep")
+    parser.add_argument('--output-dir', help="folder for output files, overrides output_dir option")
+    parser.add_argument('--plots', action='store_true', help="save charts of fitness value, average and stdev")
+    parser.add_argument('--json', action='store_true', help="print result as JSON")
+    parser.add_argument('--resume', action='store_true', help="continue from checkpoint of interrupted run")
+    parser.add_argument('--profile', action='store_true', help="time every stage of epoch, write profile.json")
+    parser.add_argument('--sweep', action='store_true', help="run every combination of swept options")
+    parser.add_argument('--workers', type=int, help="number of processes running sweep, CPU count by default")
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    arguments = parse_arguments(arguments)
+
+    if arguments.sweep:
+        rows = run_sweep_file(arguments.config, arguments.workers, arguments.output_dir)
+        print(f"{len(rows)} runs finished, results table is sweep.csv in output folder")
+        return
+
+    options = load_config(arguments.config)
+    if arguments.output_dir is not None:
+        options['output_dir'] = arguments.output_dir
+    if arguments.resume:
+        options['resume'] = True
+    if arguments.profile:
+        options['profile'] = True
+
+    result = run(options)
+
+    if arguments.plots:
+        create_plots(result)
+
+    print(json.dumps(result.to_dict(), indent=4) if arguments.json else result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
+import os
+import sys
 import tkinter as tk
+import tkinter.messagebox
 from src.algorithm.conf import RealCrossover, BinaryCrossover, RealMutation, BinaryMutation, \
     Selection, BinaryVariables, RealVariables, Config, GenOperators, binary_default_values, real_default_values, \
-    OptimizationType
-from src.algorithm.algorithm import RealAlgorithm, BinaryAlgorithm
+    OptimizationType, PopulationEngine, Objective
+from src.algorithm.algorithm import create_algorithm
+from src.algorithm.report import create_plots
 from src.models.chromosome import ChromosomeType
 
 
@@ -10,7 +14,7 @@ class GeneticAlgorithmInterface(tk.Frame):
     def __init__(self, main):
         super().__init__(main)
         self.__main_window = main
-        self.__main_window.geometry('400x450')
+        self.__main_window.geometry('400x510')
         self.__main_window.resizable(False, False)
         self.__main_window.title("Genetic Algorithm")
         self.start()
@@ -40,8 +44,10 @@ class GeneticAlgorithmInterface(tk.Frame):
         selection_enum = [e.value for e in Selection]
         cross_enum = [e.value for e in (RealCrossover if chromosome_type == ChromosomeType.REAL else BinaryCrossover)]
         mutation_enum = [e.value for e in (RealMutation if chromosome_type == ChromosomeType.REAL else BinaryMutation)]
+        engine_enum = [e.value for e in PopulationEngine]
+        objective_enum = [e.value for e in Objective]
 
-        dropdown_variables = [optimization_enum, selection_enum, mutation_enum, cross_enum]
+        dropdown_variables = [optimization_enum, selection_enum, mutation_enum, cross_enum, engine_enum, objective_enum]
 
         for idx, enum in enumerate(dropdown_variables):
             frame = tk.Frame(self.__main_window)
@@ -88,6 +94,8 @@ def configure_and_start_algorithm(variables, chromosome_type):
                                variables[BinaryVariables.MUTATION_PROBABILITY.value]) \
                 .with_selection(variables[GenOperators.SELECTION.value],
                                 variables[BinaryVariables.SELECTION_PERCENTAGE.value]) \
+                .with_population_engine(variables[GenOperators.ENGINE.value]) \
+                .with_objective(variables[GenOperators.OBJECTIVE.value]) \
                 .with_chromosome_type(chromosome_type)
         if ChromosomeType.BINARY == chromosome_type:
             config.with_inversion(variables[BinaryVariables.INVERSION_PROBABILITY.value]) \
@@ -99,4 +107,12 @@ def configure_and_start_algorithm(variables, chromosome_type):
         print("Bad config")
         return
 
-    RealAlgorithm(config).start() if ChromosomeType.REAL == chromosome_type else BinaryAlgorithm(config).start()
+    # GUI keeps writing next to main.py
+    config.output_dir = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), 'output')
+
+    result = create_algorithm(config).start()
+
+    # Creating plots
+    create_plots(result)
+
+    tk.messagebox.showinfo("Solution found", result.summary())
@@ -0,0 +1,371 @@
+import math
+import numpy as np
+from abc import ABC, abstractmethod
+from src.models import masks
+from src.models.chromosome import calculate_binary_length, decode_binary, gene_intervals
+from src.models.objective import booth
+from src.utils import utils
+from src.algorithm.conf import SelectionWeighting, Statistic, BoundHandling, default_statistics
+
+
+# Whole population kept in one genotype matrix (first axis = member) and one fitness vector, both are views of
+# one of two preallocated buffers, current generation and the next one
+class ArrayPopulation(ABC):
+    def __init__(self, interval, precision, size, optimization, objective=booth, fitness_cache=None, genes_number=2,
+                 rng=None, profiler=None):
+        self.rng = rng if rng is not None else np.random.default_rng()  # Every random draw of run comes from it
+        self.profiler = profiler
+        self.size = size
+        self.optimization = optimization
+        self.objective = objective
+        self.fitness_cache = fitness_cache
+
+        # chromosome config, interval is (2, genes) array of gene bounds
+        self.interval = gene_intervals(interval, genes_number)
+        self.precision = precision
+        self.genes_number = genes_number
+
+        self.buffers = [self.empty_buffer(self.size), self.empty_buffer(self.size)]
+        self.use_buffer(0)
+        self.extend(self.random_genotypes(self.size), np.full(self.size, np.nan), dirty=True)
+
+    def __len__(self):
+        return self.genotypes.shape[0]
+
+    @abstractmethod
+    def random_genotypes(self, number):
+        pass
+
+    @abstractmethod
+    def empty_genotypes(self, number):
+        pass
+
+    def empty_buffer(self, capacity):
+        # Genotypes, fitness values and dirty flags (members changed since their last evaluation)
+        return self.empty_genotypes(capacity), np.empty(capacity), np.empty(capacity, dtype=bool)
+
+    def use_buffer(self, members_number):
+        self.genotypes, self.fitness_values, self.dirty = (array[:members_number] for array in self.buffers[0])
+
+    def count(self, name: str, number=1):
+        # Counted only when profiling is enabled
+        if self.profiler is not None:
+            self.profiler.count(name, number)
+
+    def reserve(self, capacity):
+        # Buffers grow only when selection keeps more members than population size
+        if capacity > self.buffers[0][1].shape[0]:
+            members_number = len(self)
+            self.buffers = [tuple(np.concatenate((array, np.empty((capacity - array.shape[0],) + array.shape[1:],
+                                                                  array.dtype)))
+                                  for array in buffer) for buffer in self.buffers]
+            self.use_buffer(members_number)
+
+    @abstractmethod
+    def decode(self, genotypes):
+        pass
+
+    def calculate_fitness_values(self, genotypes):
+        values = self.decode(genotypes)
+        if self.fitness_cache is None:
+            return self.objective(values)
+
+        return self.fitness_cache.evaluate(self.genotype_keys(genotypes, values), values, self.objective)
+
+    def genotype_keys(self, genotypes, values):
+        return self.fitness_cache.keys(values)
+
+    def update_fitness_values(self):
+        # Fitness is evaluated lazily, only for members changed since their last evaluation
+        if np.any(self.dirty):
+            self.fitness_values[self.dirty] = self.calculate_fitness_values(self.genotypes[self.dirty])
+            self.dirty[:] = False
+
+    def ranking_keys(self, fitness_values):
+        return utils.ranking_keys(fitness_values, self.optimization)
+
+    def best_indices(self, number):
+        return utils.best_indices(self.ranking_keys(self.fitness_values), number)
+
+    def best_index(self):
+        return int(np.argmin(self.ranking_keys(self.fitness_values)))
+
+    def keep(self, indices):
+        # Kept members are gathered into the other buffer, which becomes the current one
+        self.reserve(len(indices))
+        for current, following in zip((self.genotypes, self.fitness_values, self.dirty), self.buffers[1]):
+            np.take(current, indices, axis=0, out=following[:len(indices)], mode='clip')
+
+        self.buffers.reverse()
+        self.use_buffer(len(indices))
+
+    def extend(self, genotypes, fitness_values, dirty=False):
+        # Written after current members, into the same buffer
+        start, end = len(self), len(self) + genotypes.shape[0]
+        self.reserve(end)
+        for array, values in zip(self.buffers[0], (genotypes, fitness_values, dirty)):
+            array[start:end] = values
+
+        self.use_buffer(end)
+
+    @abstractmethod
+    def diversity(self):
+        pass
+
+    def state(self):
+        # Copies, buffers are overwritten by next generations
+        return {'genotypes': self.genotypes.copy(), 'fitness_values': self.fitness_values.copy(),
+                'dirty': self.dirty.copy()}
+
+    def restore(self, state):
+        self.use_buffer(0)
+        self.extend(np.asarray(state['genotypes']), state['fitness_values'], state['dirty'])
+
+    def statistics(self, statistics=default_statistics, quantiles=()):
+        self.update_fitness_values()
+        keys = self.ranking_keys(self.fitness_values)
+        best_idx = int(np.argmin(keys))
+
+        return {'best_values': self.decode(self.genotypes[best_idx:best_idx + 1])[0].tolist(),
+                'fitness_value': float(self.fitness_values[best_idx]),
+                **utils.fitness_statistics(self.fitness_values, keys, statistics, quantiles),
+                **({'diversity': self.diversity()} if Statistic.DIVERSITY.value in statistics else {})}
+
+    def best_selection(self, percentage: int, limit: int = None):
+        self.update_fitness_values()
+        number_of_selected_members = utils.selected_number(self.size, percentage, limit)
+        self.keep(self.best_indices(number_of_selected_members))
+
+    def roulette_wheel_selection(self, percentage: int, weighting: str = SelectionWeighting.FITNESS.value,
+                                 limit: int = None):
+        self.update_fitness_values()
+        weights = utils.selection_weights(self.fitness_values, self.optimization, weighting)
+        number_of_selected_members = utils.selected_number(self.size, percentage, limit)
+
+        self.keep(utils.roulette_wheel_indices(self.rng, weights, number_of_selected_members))
+
+    def stochastic_universal_selection(self, percentage: int, weighting: str = SelectionWeighting.FITNESS.value,
+                                       limit: int = None):
+        self.update_fitness_values()
+        weights = utils.selection_weights(self.fitness_values, self.optimization, weighting)
+        number_of_selected_members = utils.selected_number(self.size, percentage, limit)
+
+        self.keep(utils.stochastic_universal_indices(self.rng, weights, number_of_selected_members))
+
+    def tournament_selection(self, tournament_size: int, tournaments_number: int = None, replacement: bool = False,
+                             limit: int = None):
+        self.update_fitness_values()
+        self.keep(utils.tournament_winners(self.rng, self.ranking_keys(self.fitness_values), tournament_size,
+                                           tournaments_number, replacement, limit))
+
+    def elite_strategy(self, percentage: int):
+        self.update_fitness_values()
+        elite_members_nr = math.ceil(self.size * (percentage / 100))
+        elite_indices = self.best_indices(elite_members_nr)
+
+        elite_genotypes = self.genotypes[elite_indices]
+        elite_fitness_values = self.fitness_values[elite_indices]
+
+        rest = np.ones(len(self), dtype=bool)
+        rest[elite_indices] = False
+        self.keep(np.flatnonzero(rest))
+
+        return elite_genotypes, elite_fitness_values
+
+    def emigrants(self, number: int):
+        # Copies of best members, ranked the same way as elite
+        self.update_fitness_values()
+        best_indices = self.best_indices(number)
+
+        return self.genotypes[best_indices], self.fitness_values[best_indices]
+
+    def immigrate(self, genotypes, fitness_values):
+        # Immigrants come already evaluated and replace the worst members
+        self.update_fitness_values()
+        worst_indices = utils.best_indices(-self.ranking_keys(self.fitness_values), genotypes.shape[0])
+
+        self.genotypes[worst_indices] = genotypes
+        self.fitness_values[worst_indices] = fitness_values
+        self.dirty[worst_indices] = False
+
+    def breed(self, elite_genotypes, crossover):
+        # Crossover returns children with their fitness values, NaN for children not evaluated yet,
+        # children are written straight into current buffer after selected members
+        pool = np.concatenate((self.genotypes, elite_genotypes))
+        children_size = self.size - elite_genotypes.shape[0]
+
+        while len(self) < children_size:
+            # Most crossovers give two children per pair, so no more pairs are drawn than needed
+            missing_members_nr = children_size - len(self)
+            first, second = utils.random_pairs(self.rng, pool.shape[0], math.ceil(missing_members_nr / 2))
+            children, fitness_values = crossover(pool[first], pool[second])
+            self.extend(children[:missing_members_nr], fitness_values[:missing_members_nr],
+                        dirty=np.isnan(fitness_values[:missing_members_nr]))
+
+    def crossover_succeeded(self, pairs_number, probability):
+        return self.rng.random(pairs_number) < probability
+
+    @staticmethod
+    def not_evaluated(children):
+        return children, np.full(children.shape[0], np.nan)
+
+
+class ArrayPopulationReal(ArrayPopulation):
+    def __init__(self, interval, precision, size, optimization, objective=booth, fitness_cache=None, genes_number=2,
+                 rng=None, profiler=None):
+        super().__init__(interval, precision, size, optimization, objective, fitness_cache, genes_number, rng, profiler)
+
+    def random_genotypes(self, number):
+        return self.rng.uniform(self.interval[0], self.interval[1], size=(number, self.genes_number))
+
+    def empty_genotypes(self, number):
+        return np.empty((number, self.genes_number))
+
+    def decode(self, genotypes):
+        return genotypes
+
+    def diversity(self):
+        return utils.mean_gene_variance(self.genotypes)
+
+    def in_interval(self, genotypes):
+        return np.all((self.interval[0] <= genotypes) & (genotypes <= self.interval[1]), axis=-1)
+
+    def arithmetic_crossover(self, parents1, parents2, probability: float):
+        succeeded = self.crossover_succeeded(parents1.shape[0], probability)
+        parents1, parents2 = parents1[succeeded], parents2[succeeded]
+
+        return self.not_evaluated(np.concatenate((probability * parents1 + (1 - probability) * parents2,
+                                                  (1 - probability) * parents1 + probability * parents2)))
+
+    def blend_crossover(self, parents1, parents2, probability: float, alpha: float, beta: float = None,
+                        bound_handling: str = BoundHandling.REJECT.value):
+        succeeded = self.crossover_succeeded(parents1.shape[0], probability)
+        parents1, parents2 = np.tile(parents1[succeeded], (2, 1)), np.tile(parents2[succeeded], (2, 1))
+        beta = beta if beta is not None else alpha
+
+        distance = np.abs(parents1 - parents2)
+        low = np.minimum(parents1, parents2) - alpha * distance
+        high = np.maximum(parents1, parents2) + beta * distance
+        if BoundHandling.TRUNCATE.value == bound_handling:
+            # Sampled directly from the part of blend range inside interval
+            low, high = np.maximum(low, self.interval[0]), np.minimum(high, self.interval[1])
+
+        children = self.rng.uniform(low, high)
+        if BoundHandling.REJECT.value != bound_handling:
+            return self.not_evaluated(utils.repair(children, self.interval, bound_handling))
+
+        # Redraw only the children that landed outside the interval
+        rejected = ~self.in_interval(children)
+        while np.any(rejected):
+            self.count('blend_rejected', np.count_nonzero(rejected))
+            children[rejected] = self.rng.uniform(low[rejected], high[rejected])
+            rejected[rejected] = ~self.in_interval(children[rejected])
+
+        return self.not_evaluated(children)
+
+    def average_crossover(self, parents1, parents2, probability: float):
+        succeeded = self.rng.random(parents1.shape[0]) <= probability
+
+        return self.not_evaluated((parents1[succeeded] + parents2[succeeded]) / 2)
+
+    def linear_crossover(self, parents1, parents2, probability: float,
+                         bound_handling: str = BoundHandling.REJECT.value):
+        if BoundHandling.TRUNCATE.value == bound_handling:
+            raise ValueError("Truncate bound handling is defined only for blend crossover")
+        succeeded = self.rng.random(parents1.shape[0]) <= probability
+        parents1, parents2 = parents1[succeeded], parents2[succeeded]
+
+        candidates = np.stack((0.5 * parents1 + 0.5 * parents2,
+                               1.5 * parents1 - 0.5 * parents2,
+                               -0.5 * parents1 + 1.5 * parents2), axis=1)
+        if BoundHandling.REJECT.value != bound_handling:
+            candidates = utils.repair(candidates, self.interval, bound_handling)
+        pairs_number = candidates.shape[0]
+        valid = self.in_interval(candidates)
+        self.count('linear_rejected', valid.size - np.count_nonzero(valid))
+
+        # Only pairs with three valid candidates are ranked, so only they are evaluated here, children keep their
+        # fitness values. Candidates outside interval are never evaluated, two valid ones are evaluated later
+        ranked = np.count_nonzero(valid, axis=1) == 3
+        fitness_values = np.full((pairs_number, 3), np.nan)
+        keys = np.where(valid, 0.0, np.inf)
+        if np.any(ranked):
+            fitness_values[ranked] = self.calculate_fitness_values(
+                candidates[ranked].reshape(-1, self.genes_number)).reshape(-1, 3)
+            keys[ranked] = self.ranking_keys(fitness_values[ranked])
+
+        # Two best valid candidates of every pair, pairs with less than two valid candidates give nothing
+        order = np.argsort(keys, axis=1, kind='stable')[:, :2]
+        fertile = np.isfinite(np.take_along_axis(keys, order, axis=1)).all(axis=1)
+        rows = np.arange(pairs_number)[:, None]
+
+        return (candidates[rows, order][fertile].reshape(-1, self.genes_number),
+                fitness_values[rows, order][fertile].ravel())
+
+    def uniform_mutation(self, probability: float):
+        mutated = np.flatnonzero(self.rng.random(len(self)) <= probability)
+        genes = self.rng.integers(self.genes_number, size=mutated.size)
+
+        self.genotypes[mutated, genes] = self.rng.uniform(self.interval[0][genes], self.interval[1][genes])
+        self.dirty[mutated] = True
+
+    def gauss_mutation(self, probability: float):
+        mutated = np.flatnonzero(self.rng.random(len(self)) <= probability)
+        shifted = self.genotypes[mutated] + self.rng.normal(size=(mutated.size, 1))
+
+        # The shift is applied only when every gene stays inside the interval
+        accepted = self.in_interval(shifted)
+        self.genotypes[mutated[accepted]] = shifted[accepted]
+        self.dirty[mutated[accepted]] = True
+
+
+# Bits are packed with np.packbits, genotypes shape is (members, genes, bytes per chromosome)
+class ArrayPopulationBinary(ArrayPopulation):
+    def __init__(self, interval, precision, size, optimization, objective=booth, fitness_cache=None, genes_number=2,
+                 rng=None, profiler=None):
+        self.chromosome_length = calculate_binary_length(gene_intervals(interval, genes_number), precision)
+        super().__init__(interval, precision, size, optimization, objective, fitness_cache, genes_number, rng, profiler)
+
+    def random_genotypes(self, number):
+        return np.packbits(self.rng.integers(2, size=(number, self.genes_number, self.chromosome_length),
+                                             dtype=np.uint8), axis=-1)
+
+    def empty_genotypes(self, number):
+        return np.empty((number, self.genes_number, math.ceil(self.chromosome_length / 8)), dtype=np.uint8)
+
+    def genotype_keys(self, genotypes, values):
+        # Binary genotypes are exact, packed bits are used as keys
+        return [row.tobytes() for row in genotypes.reshape(genotypes.shape[0], -1)]
+
+    def decode(self, genotypes):
+        return decode_binary(genotypes, self.interval, self.chromosome_length)
+
+    def diversity(self):
+        return utils.mean_hamming_distance(np.unpackbits(self.genotypes, axis=-1, count=self.chromosome_length))
+
+    def multipoint_crossover(self, parents1, parents2, probability: float, crossover_points_number: int):
+        succeeded = self.crossover_succeeded(parents1.shape[0], probability)
+        parents1, parents2 = parents1[succeeded], parents2[succeeded]
+
+        mask = masks.crossover_mask(self.rng, parents1.shape[:-1], self.chromosome_length, crossover_points_number)
+        return self.not_evaluated(np.concatenate(masks.swap(parents1, parents2, mask)))
+
+    def homogeneous_crossover(self, parents1, parents2, probability: float):
+        mask = masks.homogeneous_mask(self.rng, parents1.shape[:-1], self.chromosome_length, probability)
+        return self.not_evaluated(np.concatenate(masks.swap(parents1, parents2, mask)))
+
+    def boundary_mutation(self, probability: float):
+        mask = masks.boundary_mask(self.rng, (len(self), self.genes_number), self.chromosome_length, probability)
+        self.genotypes ^= mask
+        self.dirty |= masks.changed(mask)
+
+    def multipoint_mutation(self, probability: float, mutation_points_number: int):
+        mask = masks.multipoint_mask(self.rng, (len(self), self.genes_number), self.chromosome_length, probability,
+                                     mutation_points_number)
+        self.genotypes ^= mask
+        self.dirty |= masks.changed(mask)
+
+    def inversion(self, probability: float):
+        mask = masks.inversion_mask(self.rng, (len(self), self.genes_number), self.chromosome_length, probability)
+        self.genotypes ^= mask
+        self.dirty |= masks.changed(mask)
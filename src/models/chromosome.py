@@ -1,5 +1,4 @@
 import numpy as np
-import random
 import math
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -10,42 +9,81 @@ class ChromosomeType(Enum):
     REAL = 'real chromosome'
 
 
+def gene_intervals(interval, genes_number):
+    # Bounds of every gene as (2, genes) array, first row are left endpoints, one [a, b] interval is shared by all genes
+    interval = np.asarray(interval, dtype=float)
+    if interval.ndim == 1:
+        return np.repeat(interval[:, None], genes_number, axis=1)
+    if interval.shape != (genes_number, 2):
+        raise ValueError(f"Expected {genes_number} gene intervals, got {interval.shape[0]}")
+    return interval.T.copy()
+
+
+def calculate_binary_length(interval, precision):
+    # All genes have the same length, the widest interval decides it
+    return math.ceil(math.log2(float(np.max(np.subtract(interval[1], interval[0]))) * math.pow(10, precision)) +
+                     math.log2(1))
+
+
+def decode_binary(packed, interval, length):
+    # Decodes any number of chromosomes at once, bits are packed with np.packbits along the last axis
+    weights = 2.0 ** np.arange(length - 1, -1, -1)
+    return interval[0] + (np.unpackbits(packed, axis=-1, count=length) @ weights) * (interval[1] - interval[0]) / (
+            math.pow(2, length) - 1)
+
+
+# Chromosome keeps all genes of member in one array, genes are written in place by population.
+# Interval (2, genes) and binary length are shared by all members, so population keeps them and passes them in
 class Chromosome(ABC):
+    __slots__ = ()
 
+    @property
     @abstractmethod
-    def calculate_value(self):
+    def genotype(self):
+        pass
+
+    @abstractmethod
+    def calculate_values(self, interval, length=None):
         pass
 
 
 class BinaryChromosome(Chromosome):
-    def __init__(self, interval, precision):
-        self.interval = interval
-        self.precision = precision
-        self.binary_arr = np.random.randint(2, size=(self.__calculate_length(),))
+    __slots__ = ('packed',)
+
+    def __init__(self, genes_number=2, length=1):
+        # Bits are kept packed, eight in a byte, one row per gene
+        self.packed = np.zeros((genes_number, math.ceil(length / 8)), dtype=np.uint8)
 
-    def __calculate_length(self):
-        return math.ceil(math.log2((self.interval[1] - self.interval[0]) * math.pow(10, self.precision)) + math.log2(1))
+    @property
+    def genotype(self):
+        return self.packed
 
-    def calculate_value(self):
-        binary_string = ''.join([str(elem) for elem in self.binary_arr])
-        return self.interval[0] + int(binary_string, 2) * (self.interval[1] - self.interval[0]) / (
-                    math.pow(2, self.binary_arr.size) - 1)
+    def flip(self, packed_mask):
+        self.packed ^= packed_mask
+
+    def calculate_values(self, interval, length=None):
+        return decode_binary(self.packed, interval, length)
 
 
 class RealChromosome(Chromosome):
-    def __init__(self, interval):
-        self.interval = interval
-        self.value = random.uniform(self.interval[0], self.interval[1])
+    __slots__ = ('genes',)
+
+    def __init__(self, genes_number=2):
+        self.genes = np.zeros(genes_number)
+
+    @property
+    def genotype(self):
+        return self.genes
 
-    def calculate_value(self):
-        return self.value
+    def calculate_values(self, interval, length=None):
+        return self.genes
 
-    def is_value_in_interval(self):
-        return self.interval[0] <= self.value <= self.interval[1]
+    def is_in_interval(self, interval):
+        return bool(np.all((interval[0] <= self.genes) & (self.genes <= interval[1])))
 
 
-def create_chromosome(chromosome_type: ChromosomeType, interval, precision=6):
+def create_chromosome(chromosome_type: ChromosomeType, genes_number=2, length=None):
     if ChromosomeType.BINARY == chromosome_type:
-        return BinaryChromosome(interval, precision)
+        return BinaryChromosome(genes_number, length)
     elif ChromosomeType.REAL == chromosome_type:
-        return RealChromosome(interval)
+        return RealChromosome(genes_number)
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+# Masks for binary operators, shape is (members, genes) and bits are packed with np.packbits along the last axis,
+# random bits come from the numpy Generator of the run
+
+def random_points(rng, shape, length, points_number):
+    # Distinct points from [0, length - 2] for every chromosome
+    return np.argsort(rng.random(shape + (length - 1,)), axis=-1)[..., :points_number]
+
+
+def points_mask(points, length):
+    mask = np.zeros(points.shape[:-1] + (length,), dtype=np.uint8)
+    np.put_along_axis(mask, points, 1, axis=-1)
+    return mask
+
+
+def crossover_mask(rng, shape, length, crossover_points_number):
+    # Bits after an odd number of crossover points come from the other parent
+    points = points_mask(random_points(rng, shape, length, crossover_points_number), length)
+    return np.packbits(np.cumsum(points, axis=-1, dtype=np.uint8) & 1, axis=-1)
+
+
+def homogeneous_mask(rng, shape, length, probability):
+    return np.packbits(rng.random(shape + (length,)) <= probability, axis=-1)
+
+
+def boundary_mask(rng, shape, length, probability):
+    which_boundary = rng.integers(2, size=shape)
+    mutated = rng.random(shape) <= probability
+
+    points = np.where(which_boundary, length - 1, 0)[..., None]
+    return np.packbits(points_mask(points, length) * mutated[..., None].astype(np.uint8), axis=-1)
+
+
+def multipoint_mask(rng, shape, length, probability, mutation_points_number):
+    points = random_points(rng, shape, length, mutation_points_number)
+    mutated = rng.random(shape) <= probability
+
+    return np.packbits(points_mask(points, length) * mutated[..., None].astype(np.uint8), axis=-1)
+
+
+def inversion_mask(rng, shape, length, probability):
+    # Whole member is inverted or not, every chromosome between its own two points
+    inverted = rng.random(shape[0]) <= probability
+    points = np.sort(random_points(rng, shape, length, 2), axis=-1)
+
+    bit_indices = np.arange(length)
+    mask = (points[..., :1] <= bit_indices) & (bit_indices < points[..., 1:]) & inverted[:, None, None]
+    return np.packbits(mask, axis=-1)
+
+
+def swap(genotypes1, genotypes2, mask):
+    difference = (genotypes1 ^ genotypes2) & mask
+    return genotypes1 ^ difference, genotypes2 ^ difference
+
+
+def changed(mask):
+    # Members with at least one bit flipped by mask
+    return mask.any(axis=tuple(range(1, mask.ndim)))
@@ -1,22 +1,14 @@
-import numpy as np
-import math
-from src.models.chromosome import create_chromosome
+from src.models.chromosome import Chromosome
 
 
+# Compact member, chromosome config (interval, precision, chromosome type) is kept once by population
 class Member:
-    def __init__(self, interval, precision, chromosome_type):
-        self.chromosome_type = chromosome_type
-        self.chromosomes = np.array([create_chromosome(chromosome_type, interval, precision) for _ in range(2)])
-        self.fitness_value = self.calculate_fitness_fun()
+    __slots__ = ('chromosome', 'fitness_value', 'dirty')
 
-    def calculate_fitness_fun(self):
-        x1_val = self.chromosomes[0].calculate_value()
-        x2_val = self.chromosomes[1].calculate_value()
-
-        return math.pow(x1_val + 2 * x2_val - 7, 2) + math.pow(2 * x1_val + x2_val - 5, 2)
-
-    def update_fitness_value(self):
-        self.fitness_value = self.calculate_fitness_fun()
+    def __init__(self, chromosome: Chromosome):
+        self.chromosome = chromosome
+        self.fitness_value = None  # Evaluated lazily by population, together with other changed members
+        self.dirty = True  # Chromosome changed since last evaluation
 
     def __str__(self):
-        return f"[{''.join(str(chromosome.calculate_value()) + ' ; ' for chromosome in self.chromosomes)}{self.fitness_value}]"
+        return f"[{''.join(str(gene) + ' ; ' for gene in self.chromosome.genotype.tolist())}{self.fitness_value}]"
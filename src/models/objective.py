@@ -0,0 +1,49 @@
+import numpy as np
+from src.algorithm.conf import Objective
+
+
+# Every objective takes (N, d) matrix of chromosome values and returns (N,) vector of fitness values
+
+def booth(values):
+    return (values[:, 0] + 2 * values[:, 1] - 7) ** 2 + (2 * values[:, 0] + values[:, 1] - 5) ** 2
+
+
+def rastrigin(values):
+    return 10 * values.shape[1] + np.sum(values ** 2 - 10 * np.cos(2 * np.pi * values), axis=1)
+
+
+def rosenbrock(values):
+    return np.sum(100 * (values[:, 1:] - values[:, :-1] ** 2) ** 2 + (1 - values[:, :-1]) ** 2, axis=1)
+
+
+def ackley(values):
+    genes_number = values.shape[1]
+    return -20 * np.exp(-0.2 * np.sqrt(np.sum(values ** 2, axis=1) / genes_number)) \
+        - np.exp(np.sum(np.cos(2 * np.pi * values), axis=1) / genes_number) + 20 + np.e
+
+
+def sphere(values):
+    return np.sum(values ** 2, axis=1)
+
+
+objectives = {
+    Objective.BOOTH.value: booth,
+    Objective.RASTRIGIN.value: rastrigin,
+    Objective.ROSENBROCK.value: rosenbrock,
+    Objective.ACKLEY.value: ackley,
+    Objective.SPHERE.value: sphere
+}
+
+# Objectives defined only for one dimension, others take any number of genes
+dimensions = {
+    Objective.BOOTH.value: 2
+}
+
+
+def get_objective(objective, genes_number=2):
+    # Custom objectives are passed as callables, built-in ones by name
+    if callable(objective):
+        return objective
+    if objective in dimensions and dimensions[objective] != genes_number:
+        raise ValueError(f"{objective} objective takes {dimensions[objective]} genes, got genes_number={genes_number}")
+    return objectives[objective]
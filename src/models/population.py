@@ -1,285 +1,379 @@
 import math
 import numpy as np
-import random
-from abc import ABC
-from functools import cmp_to_key
+from abc import ABC, abstractmethod
 from src.models.member import Member
-from src.utils.utils import compare_members
-from src.algorithm.conf import OptimizationType
+from src.models import masks
+from src.models.chromosome import calculate_binary_length, decode_binary, gene_intervals, create_chromosome
+from src.utils.utils import ranking_keys, best_indices, tournament_winners, selection_weights, \
+    roulette_wheel_indices, stochastic_universal_indices, fitness_statistics, mean_hamming_distance, mean_gene_variance, \
+    repair, selected_number
+from src.models.objective import booth
+from src.algorithm.conf import SelectionWeighting, Statistic, BoundHandling, default_statistics
 
 
 class Population(ABC):
-    def __init__(self, interval, precision, chromosome_type, size, optimization):
+    chromosome_length = None  # Bits of every binary gene
+
+    def __init__(self, interval, precision, chromosome_type, size, optimization, objective=booth, fitness_cache=None,
+                 genes_number=2, rng=None, profiler=None):
+        self.rng = rng if rng is not None else np.random.default_rng()  # Every random draw of run comes from it
+        self.profiler = profiler
         self.size = size
-        self.members = [Member(interval, precision, chromosome_type) for _ in range(self.size)]
         self.optimization = optimization
+        self.objective = objective
+        self.fitness_cache = fitness_cache
 
-        # chromosome config
-        self.interval = interval
+        # chromosome config, shared by all members
+        self.interval = gene_intervals(interval, genes_number)
         self.precision = precision
         self.chromosome_type = chromosome_type
+        self.genes_number = genes_number
 
-    def create_child(self):
-        return Member(self.interval, self.precision, self.chromosome_type)
+        # Members of current and next generation, allocated once, children reuse members left out of population
+        self.buffer = [self.new_member() for _ in range(2 * self.size)]
+        self.spare_members = list(self.buffer)
+        self.members = self.create_children(self.random_genotypes(self.size))
 
-    def best_selection(self, percentage: int):
-        result = sorted(self.members, key=cmp_to_key(compare_members),
-                        reverse=OptimizationType.MAXIMIZATION.value == self.optimization)
-        number_of_selected_members = math.ceil(self.size * percentage / 100)
+    @abstractmethod
+    def random_genotypes(self, number):
+        pass
 
-        self.members = result[:number_of_selected_members]
-        return result[:number_of_selected_members]
+    def new_member(self):
+        return Member(create_chromosome(self.chromosome_type, self.genes_number, self.chromosome_length))
 
-    def roulette_wheel_selection(self, percentage: int):
-        fitness_sum = sum(1 / member.fitness_value for member in self.members)
-        selection_prob_fun = (lambda member: member.fitness_value / fitness_sum) \
-            if OptimizationType.MAXIMIZATION.value == self.optimization \
-            else (lambda member: (1 / member.fitness_value) / fitness_sum)
+    def create_child(self):
+        # Genes of spare member are overwritten by operator, new member is created only when no spare one is left
+        if len(self.spare_members) == 0:
+            self.buffer.append(self.new_member())
+            self.spare_members.append(self.buffer[-1])
+
+        child = self.spare_members.pop()
+        child.fitness_value = None
+        child.dirty = True
+        return child
+
+    def count(self, name: str, number=1):
+        # Counted only when profiling is enabled
+        if self.profiler is not None:
+            self.profiler.count(name, number)
+
+    def next_generation(self):
+        # Called when population is complete, members left out of it are spare members for next generation
+        alive = {id(member) for member in self.members}
+        self.spare_members = [member for member in self.buffer if id(member) not in alive]
+
+    def update_fitness_values(self, members=None):
+        # Fitness is evaluated lazily, in one objective call for all members changed since their last evaluation
+        members = [member for member in (self.members if members is None else members) if member.dirty]
+        if len(members) == 0:
+            return
 
-        selection_probability = list(map(selection_prob_fun, self.members))
-        number_of_selected_members = math.ceil(self.size * percentage / 100)
+        values = self.values(members)
+        fitness_values = self.objective(values) if self.fitness_cache is None \
+            else self.fitness_cache.evaluate(self.genotype_keys(members, values), values, self.objective)
 
-        selected_members = random.choices(self.members, weights=selection_probability, k=number_of_selected_members)
+        for member, fitness_value in zip(members, fitness_values):
+            member.fitness_value = float(fitness_value)
+            member.dirty = False
 
-        return selected_members
+    def values(self, members):
+        return np.array([member.chromosome.calculate_values(self.interval, self.chromosome_length)
+                         for member in members])
 
-    def tournament_selection(self, tournament_size: int):
-        iterations = math.floor(len(self.members) / tournament_size)
-        tournaments = []
-        winners = []
-        members_copy = self.members.copy()
+    def genotype_keys(self, members, values):
+        return self.fitness_cache.keys(values)
 
-        for idx in range(iterations):
-            tournaments.append(random.sample(members_copy, tournament_size))
-            # remove all elements that occur in one list form another
-            members_copy = [member for member in members_copy if member not in tournaments[idx]]
+    def genotypes(self, members):
+        # Chromosome values of members as one (members, genes) matrix
+        return self.values(members)
 
-        if len(members_copy) > 0:
-            tournaments.append(random.sample(members_copy, len(members_copy)))
+    def create_children(self, genotypes):
+        children = [self.create_child() for _ in range(genotypes.shape[0])]
+        for child, genotype in zip(children, genotypes):
+            child.chromosome.genotype[:] = genotype
 
-        # getting winners
-        for idx in range(len(tournaments)):
-            winner = max(tournaments[idx], key=lambda member: member.fitness_value) \
-                if OptimizationType.MAXIMIZATION.value == self.optimization \
-                else min(tournaments[idx], key=lambda member: member.fitness_value)
-            winners.append(winner)
+        return children
 
-        self.members = winners
-        return winners
+    def copy_member(self, member: Member):
+        child = self.create_child()
+        child.chromosome.genotype[:] = member.chromosome.genotype
+        child.fitness_value = member.fitness_value
+        child.dirty = member.dirty
+        return child
+
+    def take(self, indices):
+        # Members picked more than once are copied, so an operator never changes two members at once
+        taken = set()
+        members = []
+        for idx in indices.tolist():
+            members.append(self.copy_member(self.members[idx]) if idx in taken else self.members[idx])
+            taken.add(idx)
+
+        return members
+
+    def state(self):
+        # Fitness of members not evaluated yet is NaN
+        return {'genotypes': self.genotypes(self.members),
+                'fitness_values': np.array([np.nan if member.fitness_value is None else member.fitness_value
+                                            for member in self.members]),
+                'dirty': np.array([member.dirty for member in self.members])}
+
+    def restore(self, state):
+        self.members = self.create_children(np.asarray(state['genotypes']))
+        for member, fitness_value, dirty in zip(self.members, state['fitness_values'].tolist(), state['dirty'].tolist()):
+            member.fitness_value = None if math.isnan(fitness_value) else fitness_value
+            member.dirty = dirty
+        self.next_generation()
+
+    def ranking_keys(self, members):
+        return ranking_keys([member.fitness_value for member in members], self.optimization)
+
+    def statistics(self, statistics=default_statistics, quantiles=()):
+        self.update_fitness_values()
+        fitness_values = np.array([member.fitness_value for member in self.members])
+        keys = self.ranking_keys(self.members)
+        best_member = self.members[int(np.argmin(keys))]
+
+        return {'best_values': self.values([best_member])[0].tolist(),
+                'fitness_value': best_member.fitness_value,
+                **fitness_statistics(fitness_values, keys, statistics, quantiles),
+                **({'diversity': self.diversity()} if Statistic.DIVERSITY.value in statistics else {})}
+
+    def diversity(self):
+        return mean_gene_variance(self.values(self.members))
+
+    def best_selection(self, percentage: int, limit: int = None):
+        self.update_fitness_values()
+        number_of_selected_members = selected_number(self.size, percentage, limit)
+
+        self.members = [self.members[idx] for idx in best_indices(self.ranking_keys(self.members),
+                                                                  number_of_selected_members)]
+        return self.members
+
+    def roulette_wheel_selection(self, percentage: int, weighting: str = SelectionWeighting.FITNESS.value,
+                                 limit: int = None):
+        self.update_fitness_values()
+        weights = selection_weights([member.fitness_value for member in self.members], self.optimization, weighting)
+        number_of_selected_members = selected_number(self.size, percentage, limit)
+
+        self.members = self.take(roulette_wheel_indices(self.rng, weights, number_of_selected_members))
+        return self.members
+
+    def stochastic_universal_selection(self, percentage: int, weighting: str = SelectionWeighting.FITNESS.value,
+                                       limit: int = None):
+        self.update_fitness_values()
+        weights = selection_weights([member.fitness_value for member in self.members], self.optimization, weighting)
+        number_of_selected_members = selected_number(self.size, percentage, limit)
+
+        self.members = self.take(stochastic_universal_indices(self.rng, weights, number_of_selected_members))
+        return self.members
+
+    def tournament_selection(self, tournament_size: int, tournaments_number: int = None, replacement: bool = False,
+                             limit: int = None):
+        self.update_fitness_values()
+        winners = tournament_winners(self.rng, self.ranking_keys(self.members), tournament_size, tournaments_number,
+                                     replacement, limit)
+
+        self.members = self.take(winners)
+        return self.members
 
     def elite_strategy(self, percentage: int):
+        self.update_fitness_values()
         # Nr of elite members
         elite_members_nr = math.ceil(self.size * (percentage / 100))
-        sorted_members = sorted(self.members, key=cmp_to_key(compare_members),
-                                reverse=OptimizationType.MAXIMIZATION.value == self.optimization)
+        elite_indices = best_indices(self.ranking_keys(self.members), elite_members_nr)
+        elite_members = [self.members[idx] for idx in elite_indices]
 
         # Delete elite members from self.members
-        self.members = [member for member in self.members if member not in sorted_members[:elite_members_nr]]
+        elite_indices = set(elite_indices.tolist())
+        self.members = [member for idx, member in enumerate(self.members) if idx not in elite_indices]
+
+        return elite_members
+
+    def emigrants(self, number: int):
+        # Copies of best members, as genotype matrix and fitness vector
+        self.update_fitness_values()
+        members = [self.members[idx] for idx in best_indices(self.ranking_keys(self.members), number)]
+
+        return self.genotypes(members), np.array([member.fitness_value for member in members])
+
+    def immigrate(self, genotypes, fitness_values):
+        # Immigrants come already evaluated and replace the worst members
+        self.update_fitness_values()
+        worst_indices = best_indices(-self.ranking_keys(self.members), len(fitness_values))
 
-        return sorted_members[:elite_members_nr]
+        for idx, member, fitness_value in zip(worst_indices.tolist(), self.create_children(genotypes), fitness_values):
+            member.fitness_value = float(fitness_value)
+            member.dirty = False
+            self.members[idx] = member
+        self.next_generation()
 
 
 class PopulationReal(Population):
-    def __init__(self, interval, precision, chromosome_type, size, optimization):
-        super().__init__(interval, precision, chromosome_type, size, optimization)
+    def __init__(self, interval, precision, chromosome_type, size, optimization, objective=booth, fitness_cache=None,
+                 genes_number=2, rng=None, profiler=None):
+        super().__init__(interval, precision, chromosome_type, size, optimization, objective, fitness_cache,
+                         genes_number, rng, profiler)
+
+    def random_genotypes(self, number):
+        return self.rng.uniform(self.interval[0], self.interval[1], size=(number, self.genes_number))
 
     def arithmetic_crossover(self, parent1: Member, parent2: Member, probability: float):
-        if random.random() >= probability:
+        if self.rng.random() >= probability:
             return []
 
         child1 = self.create_child()
-        child1.chromosomes[0].value = probability * parent1.chromosomes[0].value + (1 - probability) * \
-                                      parent2.chromosomes[0].value
-        child1.chromosomes[1].value = probability * parent1.chromosomes[1].value + (1 - probability) * \
-                                      parent2.chromosomes[1].value
+        child1.chromosome.genes[:] = probability * parent1.chromosome.genes + (1 - probability) * parent2.chromosome.genes
 
         child2 = self.create_child()
-        child2.chromosomes[0].value = (1 - probability) * parent1.chromosomes[0].value + probability * \
-                                      parent2.chromosomes[0].value
-        child2.chromosomes[1].value = (1 - probability) * parent1.chromosomes[1].value + probability * \
-                                      parent2.chromosomes[1].value
-
-        child1.update_fitness_value()
-        child2.update_fitness_value()
+        child2.chromosome.genes[:] = (1 - probability) * parent1.chromosome.genes + probability * parent2.chromosome.genes
 
         return child1, child2
 
-    def blend_crossover(self, parent1: Member, parent2: Member, probability: float, alpha: float, beta: float = None):
-        if random.random() >= probability:
+    def repair(self, member: Member, bound_handling: str):
+        member.chromosome.genes[:] = repair(member.chromosome.genes, self.interval, bound_handling)
+
+    def blend_crossover(self, parent1: Member, parent2: Member, probability: float, alpha: float, beta: float = None,
+                        bound_handling: str = BoundHandling.REJECT.value):
+        if self.rng.random() >= probability:
             return []
 
         children = [self.create_child() for _ in range(2)]
         beta = beta if beta is not None else alpha
 
-        for child in children:
-            dx = abs(parent1.chromosomes[0].value - parent2.chromosomes[0].value)
-            dy = abs(parent1.chromosomes[1].value - parent2.chromosomes[1].value)
+        values1, values2 = parent1.chromosome.genes, parent2.chromosome.genes
+        distance = np.abs(values1 - values2)
+        low = np.minimum(values1, values2) - alpha * distance
+        high = np.maximum(values1, values2) + beta * distance
+        if BoundHandling.TRUNCATE.value == bound_handling:
+            # Sampled directly from the part of blend range inside interval
+            low, high = np.maximum(low, self.interval[0]), np.minimum(high, self.interval[1])
 
+        for child in children:
             while True:
-                child.chromosomes[0].value = random.uniform(
-                    min(parent1.chromosomes[0].value, parent2.chromosomes[0].value) - alpha * dx,
-                    max(parent1.chromosomes[0].value, parent2.chromosomes[0].value) + beta * dx)
+                child.chromosome.genes[:] = self.rng.uniform(low, high)
 
-                child.chromosomes[1].value = random.uniform(
-                    min(parent1.chromosomes[1].value, parent2.chromosomes[1].value) - alpha * dy,
-                    max(parent1.chromosomes[1].value, parent2.chromosomes[1].value) + beta * dy)
-
-                child.update_fitness_value()
-                if child.chromosomes[0].is_value_in_interval() and child.chromosomes[1].is_value_in_interval():
+                # Only rejected children are drawn more than once
+                if BoundHandling.REJECT.value != bound_handling:
+                    self.repair(child, bound_handling)
+                    break
+                if child.chromosome.is_in_interval(self.interval):
                     break
+                self.count('blend_rejected')
 
         return children
 
     def average_crossover(self, parent1: Member, parent2: Member, probability: float):
-        if not random.random() <= probability:
+        if not self.rng.random() <= probability:
             return []
 
         child = self.create_child()
-        for idx, chromosome in enumerate(child.chromosomes):
-            chromosome.value = (parent1.chromosomes[idx].value + parent2.chromosomes[idx].value) / 2
+        child.chromosome.genes[:] = (parent1.chromosome.genes + parent2.chromosome.genes) / 2
 
-        child.update_fitness_value()
         return [child]
 
-    def linear_crossover(self, parent1: Member, parent2: Member, probability: float):
-        if not random.random() <= probability:
+    def linear_crossover(self, parent1: Member, parent2: Member, probability: float,
+                         bound_handling: str = BoundHandling.REJECT.value):
+        if BoundHandling.TRUNCATE.value == bound_handling:
+            raise ValueError("Truncate bound handling is defined only for blend crossover")
+        if not self.rng.random() <= probability:
             return []
 
         children = [self.create_child() for _ in range(3)]
-        factors = [
-            [[0.5, 0.5], [0.5, 0.5]],
-            [[1.5, -0.5], [1.5, -0.5]],
-            [[-0.5, 1.5], [-0.5, 1.5]]
-        ]
-
-        for i, child in enumerate(children):
-            for j, chromosome in enumerate(child.chromosomes):
-                chromosome.value = factors[i][j][0] * parent1.chromosomes[j].value + factors[i][j][1] * \
-                                   parent2.chromosomes[j].value
-            child.update_fitness_value()
-
-        filtered_children = list(
-            filter(lambda r: r.chromosomes[0].is_value_in_interval() and r.chromosomes[1].is_value_in_interval(),
-                   children))
-        if len(filtered_children) < 2:
-            return []
+        factors = [[0.5, 0.5], [1.5, -0.5], [-0.5, 1.5]]
+
+        for child, (factor1, factor2) in zip(children, factors):
+            child.chromosome.genes[:] = factor1 * parent1.chromosome.genes + factor2 * parent2.chromosome.genes
+            if BoundHandling.REJECT.value != bound_handling:
+                self.repair(child, bound_handling)
 
-        result = sorted(filtered_children, key=cmp_to_key(compare_members),
-                        reverse=OptimizationType.MAXIMIZATION.value == self.optimization)[:2]
+        # Children outside interval are never evaluated, two valid children are evaluated later with the others
+        filtered_children = [child for child in children if child.chromosome.is_in_interval(self.interval)]
+        self.count('linear_rejected', len(children) - len(filtered_children))
+        if len(filtered_children) < 3:
+            return filtered_children if len(filtered_children) == 2 else []
 
-        return result[:2]
+        self.update_fitness_values(filtered_children)
+        return [filtered_children[idx] for idx in best_indices(self.ranking_keys(filtered_children), 2)]
 
     def uniform_mutation(self, member: Member, probability: float):
-        if not random.random() <= probability:
+        if not self.rng.random() <= probability:
             return
 
-        index_to_update = random.randint(0, 1)
-        member.chromosomes[index_to_update].value = random.uniform(self.interval[0], self.interval[1])
-        member.update_fitness_value()
+        index_to_update = self.rng.integers(self.genes_number)
+        member.chromosome.genes[index_to_update] = self.rng.uniform(self.interval[0][index_to_update],
+                                                                    self.interval[1][index_to_update])
+        member.dirty = True
 
     def gauss_mutation(self, member: Member, probability: float):
-        if not random.random() <= probability:
+        if not self.rng.random() <= probability:
             return
 
-        n_distribution = np.random.normal()
-        if (self.interval[0] <= member.chromosomes[0].value + n_distribution <= self.interval[1]) and (
-                self.interval[0] <= member.chromosomes[1].value + n_distribution <= self.interval[1]):
-            for chromosome in member.chromosomes:
-                chromosome.value += n_distribution
-            member.update_fitness_value()
+        n_distribution = self.rng.normal()
+        shifted = member.chromosome.genes + n_distribution
+        if np.all((self.interval[0] <= shifted) & (shifted <= self.interval[1])):
+            member.chromosome.genes[:] = shifted
+            member.dirty = True
 
 
 class PopulationBinary(Population):
-    def __init__(self, interval, precision, chromosome_type, size, optimization):
-        super().__init__(interval, precision, chromosome_type, size, optimization)
-
-    def multipoint_crossover(self, parent1: Member, parent2: Member, probability: float, crossover_points_number: int):
-        if random.random() >= probability:
+    def __init__(self, interval, precision, chromosome_type, size, optimization, objective=booth, fitness_cache=None,
+                 genes_number=2, rng=None, profiler=None):
+        self.chromosome_length = calculate_binary_length(gene_intervals(interval, genes_number), precision)
+        super().__init__(interval, precision, chromosome_type, size, optimization, objective, fitness_cache,
+                         genes_number, rng, profiler)
+
+    def random_genotypes(self, number):
+        return np.packbits(self.rng.integers(2, size=(number, self.genes_number, self.chromosome_length),
+                                             dtype=np.uint8), axis=-1)
+
+    def genotypes(self, members):
+        # Packed chromosomes of members as one (members, genes, bytes) matrix
+        return np.array([member.chromosome.packed for member in members])
+
+    def values(self, members):
+        # All chromosomes decoded in one call
+        return decode_binary(self.genotypes(members), self.interval, self.chromosome_length)
+
+    def genotype_keys(self, members, values):
+        # Binary genotypes are exact, packed bits are used as keys
+        return [member.chromosome.packed.tobytes() for member in members]
+
+    def diversity(self):
+        return mean_hamming_distance(np.unpackbits(self.genotypes(self.members), axis=-1,
+                                                   count=self.chromosome_length))
+
+    def apply_mask(self, mask):
+        # Only members with at least one bit flipped are changed
+        for idx in np.flatnonzero(masks.changed(mask)):
+            self.members[idx].chromosome.flip(mask[idx])
+            self.members[idx].dirty = True
+
+    def multipoint_crossover(self, parents1: list, parents2: list, probability: float, crossover_points_number: int):
+        succeeded = np.flatnonzero(self.rng.random(len(parents1)) < probability)
+        if succeeded.size == 0:
             return []
 
-        child1, child2 = self.create_child(), self.create_child()
-
-        for i in range(parent1.chromosomes.size):
-            crossover_points = sorted(np.random.choice(
-                np.arange(0, parent1.chromosomes[i].binary_arr.size - 1),
-                replace=False,
-                size=crossover_points_number))
-
-            child1.chromosomes[i].binary_arr = parent1.chromosomes[i].binary_arr.copy()
-            child2.chromosomes[i].binary_arr = parent2.chromosomes[i].binary_arr.copy()
-
-            for crossover_point in crossover_points:
-                child1.chromosomes[i].binary_arr = np.concatenate((
-                    child1.chromosomes[i].binary_arr[:crossover_point],
-                    parent2.chromosomes[i].binary_arr[crossover_point:]),
-                    axis=None)
-                child2.chromosomes[i].binary_arr = np.concatenate((
-                    child2.chromosomes[i].binary_arr[:crossover_point],
-                    parent1.chromosomes[i].binary_arr[crossover_point:]),
-                    axis=None)
-
-        child1.update_fitness_value()
-        child2.update_fitness_value()
-
-        return child1, child2
-
-    def homogeneous_crossover(self, parent1: Member, parent2: Member, probability: float):
-        child1, child2 = self.create_child(), self.create_child()
-
-        for i in range(parent1.chromosomes.size):
-            child1.chromosomes[i].binary_arr = parent1.chromosomes[i].binary_arr.copy()
-            child2.chromosomes[i].binary_arr = parent2.chromosomes[i].binary_arr.copy()
-            nr_of_bits = parent1.chromosomes[i].binary_arr.size
-
-            for idx in range(nr_of_bits):
+        genotypes1 = self.genotypes([parents1[idx] for idx in succeeded])
+        genotypes2 = self.genotypes([parents2[idx] for idx in succeeded])
+        mask = masks.crossover_mask(self.rng, genotypes1.shape[:-1], self.chromosome_length, crossover_points_number)
 
-                # success mutation
-                if random.random() <= probability:
-                    temp = child1.chromosomes[i].binary_arr[idx]
-                    child1.chromosomes[i].binary_arr[idx] = child2.chromosomes[i].binary_arr[idx]
-                    child2.chromosomes[i].binary_arr[idx] = temp
+        return self.create_children(np.concatenate(masks.swap(genotypes1, genotypes2, mask)))
 
-        child1.update_fitness_value()
-        child2.update_fitness_value()
+    def homogeneous_crossover(self, parents1: list, parents2: list, probability: float):
+        genotypes1, genotypes2 = self.genotypes(parents1), self.genotypes(parents2)
+        mask = masks.homogeneous_mask(self.rng, genotypes1.shape[:-1], self.chromosome_length, probability)
 
-        return child1, child2
-
-    def boundary_mutation(self, member: Member, probability: float):
-        for i in range(0, member.chromosomes.size):
-            which_boundary = random.randint(0, 1)
-
-            if random.random() <= probability:
-                if which_boundary:
-                    member.chromosomes[i].binary_arr[member.chromosomes[i].binary_arr.size - 1] ^= 1
-                else:
-                    member.chromosomes[i].binary_arr[0] ^= 1
-
-        member.update_fitness_value()
-
-    def multipoint_mutation(self, member: Member, probability: float, mutation_points_number: int):
-        for i in range(0, member.chromosomes.size):
-            mutation_points = sorted(np.random.choice(
-                np.arange(0, member.chromosomes[i].binary_arr.size - 1),
-                replace=False,
-                size=mutation_points_number))
-
-            if random.random() <= probability:
-                for mutation_point in mutation_points:
-                    member.chromosomes[i].binary_arr[mutation_point] ^= 1
-
-        member.update_fitness_value()
-
-    def inversion(self, member: Member, probability: float):
-        if not random.random() <= probability:
-            return
+        return self.create_children(np.concatenate(masks.swap(genotypes1, genotypes2, mask)))
 
-        for i in range(0, member.chromosomes.size):
-            inversion_points = sorted(np.random.choice(
-                np.arange(0, member.chromosomes[i].binary_arr.size - 1),
-                replace=False,
-                size=2))
+    def boundary_mutation(self, probability: float):
+        self.apply_mask(masks.boundary_mask(self.rng, (len(self.members), self.genes_number), self.chromosome_length,
+                                            probability))
 
-            for inversion_point in range(inversion_points[0], inversion_points[1]):
-                member.chromosomes[i].binary_arr[inversion_point] ^= 1
+    def multipoint_mutation(self, probability: float, mutation_points_number: int):
+        self.apply_mask(masks.multipoint_mask(self.rng, (len(self.members), self.genes_number), self.chromosome_length,
+                                              probability, mutation_points_number))
 
-        member.update_fitness_value()
+    def inversion(self, probability: float):
+        self.apply_mask(masks.inversion_mask(self.rng, (len(self.members), self.genes_number), self.chromosome_length,
+                                             probability))
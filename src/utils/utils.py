@@ -1,13 +1,145 @@
-from src.models.member import Member
+from src.algorithm.conf import OptimizationType, SelectionWeighting, Statistic, BoundHandling
+import numpy as np
 import math
 
 global_minimum = 0.0
 
 
-def compare_members(member1: Member, member2: Member):
-    if math.fabs(member1.fitness_value - global_minimum) > math.fabs(member2.fitness_value - global_minimum):
-        return 1
-    if math.fabs(member1.fitness_value - global_minimum) == math.fabs(member2.fitness_value - global_minimum):
-        return 0
+def ranking_keys(fitness_values, optimization):
+    # Lower key is better, members closer to global minimum rank first
+    distance = np.abs(np.asarray(fitness_values, dtype=float) - global_minimum)
+    return -distance if OptimizationType.MAXIMIZATION.value == optimization else distance
+
+
+def selected_number(size, percentage, limit=None):
+    # Members kept by selection, limit leaves room for elite members
+    number = math.ceil(size * percentage / 100)
+    return number if limit is None else min(number, limit)
+
+
+def best_indices(keys, number):
+    # Indices of number lowest keys ordered best first, only selected keys are sorted
+    number = min(max(number, 0), len(keys))
+    if number == 0:
+        return np.array([], dtype=int)
+
+    indices = np.argpartition(keys, number - 1)[:number]
+    return indices[np.argsort(keys[indices], kind='stable')]
+
+
+def tournament_winners(rng, keys, tournament_size, tournaments_number=None, replacement=False, limit=None):
+    # Tournaments are rows of one index matrix, winner of each row has the lowest key.
+    # Without tournaments_number there are at most as many winners as members
+    members_number = len(keys)
+    if tournaments_number is not None and limit is not None:
+        tournaments_number = min(tournaments_number, limit)
+    if replacement:
+        tournaments_number = tournaments_number if tournaments_number is not None \
+            else math.ceil(members_number / tournament_size)
+        tournaments = rng.integers(members_number, size=(tournaments_number, tournament_size))
+    elif tournaments_number is None:
+        # Every member takes part in exactly one tournament, left over members form the last, smaller one
+        permutation = rng.permutation(members_number)
+        full_tournaments_number = members_number // tournament_size
+        tournaments = permutation[:full_tournaments_number * tournament_size].reshape(-1, tournament_size)
+
+        rest = permutation[full_tournaments_number * tournament_size:]
+        winners = tournaments[np.arange(tournaments.shape[0]), np.argmin(keys[tournaments], axis=1)]
+        return winners if rest.size == 0 else np.append(winners, rest[np.argmin(keys[rest])])
     else:
-        return -1
\ No newline at end of file
+        # Next permutation is drawn only when all members already took part in a tournament
+        rounds = math.ceil(tournaments_number * tournament_size / members_number)
+        tournaments = np.concatenate([rng.permutation(members_number) for _ in range(rounds)])[
+                      :tournaments_number * tournament_size].reshape(tournaments_number, tournament_size)
+
+    return tournaments[np.arange(tournaments.shape[0]), np.argmin(keys[tournaments], axis=1)]
+
+
+def random_pairs(rng, pool_size, pairs_number):
+    # Two different members in every pair, like random.sample(pool, 2)
+    first = rng.integers(pool_size, size=pairs_number)
+    second = rng.integers(pool_size - 1, size=pairs_number)
+    second += second >= first
+
+    return first, second
+
+
+def selection_weights(fitness_values, optimization, weighting=SelectionWeighting.FITNESS.value):
+    keys = ranking_keys(fitness_values, optimization)
+
+    if SelectionWeighting.RANK.value == weighting:
+        # Linear ranking, best member weighs len(keys) and worst one 1
+        ranks = np.empty(len(keys))
+        ranks[np.argsort(keys, kind='stable')] = np.arange(len(keys))
+        return len(keys) - ranks
+
+    distance = np.abs(keys)
+    # Epsilon keeps weights finite for members at global minimum
+    weights = distance if OptimizationType.MAXIMIZATION.value == optimization \
+        else 1 / (distance + np.finfo(float).eps)
+    return weights if weights.sum() > 0 else np.ones(len(keys))
+
+
+def roulette_wheel_indices(rng, weights, number):
+    # One draw per selected member, each found in cumulative weights by binary search
+    cumulative_weights = np.cumsum(weights)
+    pointers = rng.random(number) * cumulative_weights[-1]
+
+    return np.minimum(np.searchsorted(cumulative_weights, pointers, side='right'), len(weights) - 1)
+
+
+def stochastic_universal_indices(rng, weights, number):
+    # One draw for all selected members, pointers are evenly spaced over cumulative weights
+    cumulative_weights = np.cumsum(weights)
+    pointers = (rng.random() + np.arange(number)) * (cumulative_weights[-1] / number)
+
+    return np.minimum(np.searchsorted(cumulative_weights, pointers, side='right'), len(weights) - 1)
+
+
+def repair(values, interval, bound_handling):
+    # Values outside interval are reflected back from the bound they crossed or clipped to it
+    if BoundHandling.REFLECT.value == bound_handling:
+        width = interval[1] - interval[0]
+        shifted = np.mod(np.asarray(values) - interval[0], 2 * width)
+        return interval[0] + np.where(shifted > width, 2 * width - shifted, shifted)
+
+    return np.clip(values, interval[0], interval[1])
+
+
+def fitness_statistics(fitness_values, keys, statistics, quantiles):
+    # Only enabled statistics are calculated, median and quantiles share one partition of fitness vector
+    fitness_values = np.asarray(fitness_values, dtype=float)
+    result = {}
+
+    if Statistic.WORST.value in statistics:
+        result['worst_fitness_value'] = float(fitness_values[np.argmax(keys)])
+    if Statistic.MEAN.value in statistics:
+        result['average'] = float(np.mean(fitness_values))
+    if Statistic.STDEV.value in statistics:
+        result['standard_deviation'] = float(np.std(fitness_values, ddof=1))
+
+    levels = ([0.5] if Statistic.MEDIAN.value in statistics else []) + \
+             (list(quantiles) if Statistic.QUANTILES.value in statistics else [])
+    if len(levels) > 0:
+        values = np.quantile(fitness_values, levels).tolist()
+        if Statistic.MEDIAN.value in statistics:
+            result['median'] = values.pop(0)
+        for level, value in zip(quantiles, values):
+            result[f'quantile_{level:g}'] = value
+
+    return result
+
+
+def mean_hamming_distance(bits):
+    # Mean over all pairs of members, from number of ones at every bit position instead of comparing pairs
+    members_number = bits.shape[0]
+    if members_number < 2:
+        return 0.0
+
+    ones = bits.reshape(members_number, -1).sum(axis=0, dtype=np.int64)
+    return float(np.sum(ones * (members_number - ones)) / (members_number * (members_number - 1) / 2))
+
+
+def mean_gene_variance(values):
+    # Variance of every gene over population, averaged over genes
+    return float(np.mean(np.var(values, axis=0)))